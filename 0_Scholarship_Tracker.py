@@ -1,9 +1,22 @@
 # Scholarship Tracker 6.2 — Info Beasiswa (6.1) + Progress Tracker (6.0) merged
+import time
+_t0 = time.perf_counter()
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from datetime import date, datetime
-import json, os, shutil
+from datetime import date
+import os
+
+# plotly.express is imported inside the figure builders: figures are cached, so
+# a worker only pays for it when it first draws a chart
+from tracker import datastore, figures, metrics, startup
+from tracker.deadlines import DeadlineIndex
+from tracker.gantt import build_gantt
+from tracker.progress_view import LatestProgressView
+from tracker.schema import STATUS_VALUES, clean_value, empty_df
+from tracker.table_view import PAGE_SIZES, PROGRESS_TABLE_COLUMNS, filter_rows, page_of, render_html
+from tracker.ui import bulk_panel, debug_sidebar, fragment, freshness, user_selector
+startup.imported("scholarship", _t0)
+metrics.begin("scholarship")
 
 # ===============================
 # PAGE CONFIG
@@ -13,65 +26,18 @@ st.set_page_config(page_title="🎓 Scholarship Tracker 6.2", page_icon="🎓",
 # ===============================
 # FILES / DATA UTIL
 # ===============================
-SCHOLAR_FILE = "data_scholarship.json"
-PROGRESS_FILE = "data_progress.json"
-BACKUP_SUFFIX = "_backup.json"
-
-def empty_scholar_df():
-    return pd.DataFrame(columns=[
-        "Nama User","Negara","Beasiswa","Link Beasiswa","IELTS","GPA",
-        "Other Requirements","Benefit Scholarship",
-        "Periode Pendaftaran (Mulai)","Periode Pendaftaran (Selesai)",
-        "Periode Dokumen (Mulai)","Periode Dokumen (Selesai)",
-        "Periode Wawancara (Mulai)","Periode Wawancara (Selesai)",
-        "Periode Tes (Mulai)","Periode Tes (Selesai)",
-        "Tanggal Pengumuman"
-    ])
-
-def empty_progress_df():
-    return pd.DataFrame(columns=[
-        "Nama User","Beasiswa",
-        "Status Pendaftaran","Status Dokumen","Status Wawancara","Status Tes","Status Pengumuman",
-        "Catatan","Terakhir Diperbarui"
-    ])
-
-def load_json_safely(path, empty_fn):
-    if not os.path.exists(path):
-        return empty_fn()
+def load_json_safely(table, user=None):
+    # parsed frames are cached process-wide (see tracker/datastore.py)
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            s = f.read().strip()
-            if not s:
-                return empty_fn()
-            return pd.DataFrame(json.loads(s))
-    except Exception:
-        try:
-            shutil.copy(path, path + BACKUP_SUFFIX)
-        except:
-            pass
-        st.warning(f"⚠️ File `{os.path.basename(path)}` corrupt — backup dibuat, memulai kosong.")
-        return empty_fn()
-
-def save_json_safely(df, path):
-    df_to_save = df.copy()
-    for col in df_to_save.columns:
-        df_to_save[col] = df_to_save[col].apply(
-            lambda x: x.isoformat() if isinstance(x, (date, datetime)) else ("" if pd.isna(x) else x)
-        )
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(df_to_save.to_dict(orient="records"), f, ensure_ascii=False, indent=2)
+        return datastore.load(table, user)
+    except datastore.CorruptFileError as e:
+        st.warning(f"⚠️ File `{os.path.basename(str(e))}` corrupt — backup dibuat, memulai kosong.")
+        return empty_df(table)
 
-# load data
-df_scholar = load_json_safely(SCHOLAR_FILE, empty_scholar_df)
-df_progress = load_json_safely(PROGRESS_FILE, empty_progress_df)
-
-# ensure cols exist
-for c in empty_scholar_df().columns:
-    if c not in df_scholar.columns:
-        df_scholar[c] = ""
-for c in empty_progress_df().columns:
-    if c not in df_progress.columns:
-        df_progress[c] = ""
+# load data — only the active user's partition (None = all users)
+active_user = user_selector()
+user_match = {} if active_user is None else {"Nama User": active_user}
+df_scholar = load_json_safely("scholar", active_user)
 
 # ===============================
 # STYLING (Dark Elegant)
@@ -129,6 +95,7 @@ def optional_date(label, key_suffix=None):
         if not txt:
             return None
         try:
+            import pandas as pd
             return pd.to_datetime(txt).date()
         except:
             st.warning("Format tanggal tidak valid. Gunakan YYYY-MM-DD.")
@@ -137,19 +104,22 @@ def optional_date(label, key_suffix=None):
 # ===============================
 # TABS: Info Beasiswa | Progress
 # ===============================
-tab_info, tab_progress = st.tabs(["📚 Info Beasiswa", "🚀 Progress Beasiswa"])
+# a radio instead of st.tabs: st.tabs runs every tab's code on each rerun, this
+# only runs (loads, builds charts for) the visible one
+TABS = ["📚 Info Beasiswa", "🚀 Progress Beasiswa"]
+active_tab = st.radio("Tab", TABS, horizontal=True, label_visibility="collapsed", key="main_tab")
 
 # -------------------------------
 # TAB: INFO BEASISWA (from v6.1)
 # -------------------------------
-with tab_info:
+if active_tab == TABS[0]:
     st.markdown("<div class='section-title'>📘 Info Beasiswa</div>", unsafe_allow_html=True)
 
     # Form (expander)
     with st.expander("➕ Tambah / Edit Info Beasiswa", expanded=False):
         with st.form("form_info_full", clear_on_submit=True):
             c1, c2 = st.columns(2)
-            nama_user = c1.text_input("👤 Nama User", placeholder="Contoh: Yan Marcel")
+            nama_user = c1.text_input("👤 Nama User", value=active_user or "", placeholder="Contoh: Yan Marcel")
             negara = c2.text_input("🌍 Negara Tujuan", placeholder="Contoh: United Kingdom")
             beasiswa = c1.text_input("🎯 Nama Beasiswa", placeholder="Contoh: Chevening Scholarship")
             link = c2.text_input("🔗 Link Beasiswa (optional)")
@@ -192,50 +162,72 @@ with tab_info:
                         "Periode Tes (Selesai)": str(tes_end) if tes_end else "",
                         "Tanggal Pengumuman": str(pengumuman) if pengumuman else ""
                     }
-                    df_scholar = pd.concat([df_scholar, pd.DataFrame([new_row])], ignore_index=True)
-                    save_json_safely(df_scholar, SCHOLAR_FILE)
+                    datastore.insert("scholar", [new_row])
                     st.success(f"✅ Info beasiswa '{beasiswa}' berhasil disimpan!")
                     st.experimental_rerun()
+    bulk_panel("scholar", active_user)
 
     # Gantt timeline (requires start and end)
     st.markdown("### 📅 Gantt Timeline Beasiswa")
-    events = []
-    for _, row in df_scholar.iterrows():
-        phases = [
-            ("Pendaftaran","Periode Pendaftaran (Mulai)","Periode Pendaftaran (Selesai)"),
-            ("Dokumen","Periode Dokumen (Mulai)","Periode Dokumen (Selesai)"),
-            ("Wawancara","Periode Wawancara (Mulai)","Periode Wawancara (Selesai)"),
-            ("Tes","Periode Tes (Mulai)","Periode Tes (Selesai)"),
-            ("Pengumuman","Tanggal Pengumuman","Tanggal Pengumuman")
-        ]
-        for label, sc, ec in phases:
-            if row.get(sc) and row.get(ec) and str(row.get(sc)).strip() and str(row.get(ec)).strip():
-                try:
-                    events.append({
-                        "Beasiswa": row["Beasiswa"],
-                        "Tahap": label,
-                        "Mulai": pd.to_datetime(row[sc]),
-                        "Selesai": pd.to_datetime(row[ec])
-                    })
-                except:
-                    pass
-    if events:
-        df_gantt = pd.DataFrame(events).sort_values("Mulai")
-        fig = px.timeline(df_gantt, x_start="Mulai", x_end="Selesai", y="Beasiswa",
-                          color="Tahap", title="🗓️ Timeline Beasiswa",
-                          color_discrete_sequence=px.colors.qualitative.Pastel)
-        fig.update_yaxes(autorange="reversed")
-        fig.update_layout(paper_bgcolor="#0b0f14", plot_bgcolor="#0b0f14", font_color="#e6eef6", height=420)
-        st.plotly_chart(fig, use_container_width=True)
+    # events and figure are both cached on the scholarship data version; after
+    # a save the last timeline is shown while the new one builds in the background
+    df_gantt, gantt_info = datastore.derived_latest("scholar", "gantt", build_gantt, user=active_user)
+    if not df_gantt.empty:
+        def gantt_figure():
+            import plotly.express as px
+            fig = px.timeline(df_gantt, x_start="Mulai", x_end="Selesai", y="Beasiswa",
+                              color="Tahap", title="🗓️ Timeline Beasiswa",
+                              color_discrete_sequence=px.colors.qualitative.Pastel)
+            fig.update_yaxes(autorange="reversed")
+            fig.update_layout(paper_bgcolor="#0b0f14", plot_bgcolor="#0b0f14", font_color="#e6eef6", height=420)
+            return fig
+        fig = figures.cached("gantt", gantt_info["stamp"], gantt_figure, user=active_user)
+        with metrics.timer("render", part="gantt"):
+            st.plotly_chart(fig, use_container_width=True)
+        freshness(gantt_info)
     else:
         st.info("Belum ada periode lengkap untuk menampilkan timeline. Isi tanggal pada Info Beasiswa agar muncul.")
 
+    # Upcoming deadlines (sorted phase-window index, updated on each save)
+    st.markdown("### ⏰ Deadline Terdekat")
+    @fragment
+    def deadline_panel():
+        deadlines, deadlines_info = datastore.derived_latest("scholar", "deadlines", DeadlineIndex.from_frame,
+                                                             user=active_user, combine=DeadlineIndex.merge)
+        horizon = st.select_slider("Dalam berapa hari ke depan", [7, 14, 30, 60, 90], value=30, key="deadline_days")
+        with metrics.timer("aggregate", view="deadlines"):
+            df_upcoming = deadlines.upcoming(horizon, user=active_user)
+        if not df_upcoming.empty:
+            with metrics.timer("render", part="deadlines"):
+                st.dataframe(df_upcoming, use_container_width=True, hide_index=True)
+        else:
+            st.info(f"Tidak ada periode yang berakhir dalam {horizon} hari ke depan.")
+        freshness(deadlines_info)
+        # overlapping pairs can run into the millions in the admin view: computed
+        # on demand (kept by the index until it changes), shown a page at a time
+        if st.checkbox("⚠️ Cek periode yang saling bertabrakan", key="deadline_conflicts"):
+            with metrics.timer("aggregate", view="conflicts"):
+                df_conflicts = deadlines.conflicts(active_user)
+            if df_conflicts.empty:
+                st.info("Tidak ada periode yang bertabrakan.")
+            else:
+                c1, c2 = st.columns(2)
+                page_size = c1.selectbox("Baris / halaman", PAGE_SIZES, index=1, key="conflict_page_size")
+                n_pages = max(1, -(-len(df_conflicts) // page_size))
+                page = c2.number_input("Halaman", min_value=1, max_value=n_pages, value=1, step=1, key="conflict_page")
+                page_df, total, n_pages = page_of(df_conflicts, page=int(page), page_size=page_size)
+                st.caption(f"{total} pasang periode bertabrakan · halaman {int(page)}/{n_pages}")
+                with metrics.timer("render", part="conflicts"):
+                    st.dataframe(page_df, use_container_width=True, hide_index=True)
+
+    deadline_panel()
+
     # Detail view dropdown (no big table)
     st.markdown("### 🔎 Lihat Detail Lengkap")
     if not df_scholar.empty:
         selected = st.selectbox("Pilih Beasiswa untuk melihat detail", [""] + df_scholar["Beasiswa"].tolist(), key="detail_select")
         if selected:
-            data = df_scholar[df_scholar["Beasiswa"] == selected].iloc[0].to_dict()
+            data = datastore.find("scholar", {"Beasiswa": selected}, user=active_user).iloc[0].to_dict()
             st.markdown(f"#### Detail: {data.get('Beasiswa','')}")
             st.markdown(f"**Negara:** {data.get('Negara','')}")
             st.markdown(f"**IELTS / GPA:** {data.get('IELTS','')} / {data.get('GPA','')}")
@@ -245,7 +237,7 @@ with tab_info:
             st.write(data.get("Benefit Scholarship",""))
             st.markdown("**Periode & Dates:**")
             for col in [c for c in df_scholar.columns if "Periode" in c or c == "Tanggal Pengumuman"]:
-                st.write(f"- **{col}**: {data.get(col,'')}")
+                st.write(f"- **{col}**: {clean_value(data.get(col,''))}")
             if data.get("Link Beasiswa"):
                 st.markdown(f"**Link Beasiswa:** [🌐 Buka Link]({data.get('Link Beasiswa')})")
     else:
@@ -254,13 +246,14 @@ with tab_info:
 # -------------------------------
 # TAB: PROGRESS (from v6.0)
 # -------------------------------
-with tab_progress:
+if active_tab == TABS[1]:
     st.markdown("<div class='section-title'>🚀 Progress Beasiswa</div>", unsafe_allow_html=True)
+    df_progress = load_json_safely("progress", active_user)
 
     # Form (expander)
     with st.expander("➕ Tambah Progress (klik untuk buka)", expanded=False):
         with st.form("form_progress_full", clear_on_submit=True):
-            p_user = st.text_input("👤 Nama User (progress)")
+            p_user = st.text_input("👤 Nama User (progress)", value=active_user or "")
             p_beasiswa = st.selectbox("🎓 Pilih Beasiswa", [""] + df_scholar["Beasiswa"].tolist())
             c1, c2, c3 = st.columns(3)
             s_daftar = c1.selectbox("📨 Pendaftaran", ["Belum","Proses","Selesai"])
@@ -281,53 +274,84 @@ with tab_progress:
                         "Status Pengumuman": s_peng, "Catatan": note,
                         "Terakhir Diperbarui": str(date.today())
                     }
-                    df_progress = pd.concat([df_progress, pd.DataFrame([newp])], ignore_index=True)
-                    save_json_safely(df_progress, PROGRESS_FILE)
+                    datastore.insert("progress", [newp])
                     st.success("✅ Progress tersimpan.")
                     st.experimental_rerun()
+    bulk_panel("progress", active_user)
 
     # Charts area
     st.markdown("### 📈 Progress Overview & Beasiswa Progress")
     if not df_progress.empty:
-        # pie: distribution of statuses across all stages
-        melt = df_progress.melt(id_vars=["Beasiswa","Nama User"], value_vars=[
-            "Status Pendaftaran","Status Dokumen","Status Wawancara","Status Tes","Status Pengumuman"
-        ], var_name="Tahap", value_name="Status")
-        dist = melt.groupby("Status").size().reset_index(name="Jumlah")
-        fig_pie = px.pie(dist, names="Status", values="Jumlah", title="🔵 Distribusi Status (Semua Tahap)")
-        fig_pie.update_layout(paper_bgcolor="#0b0f14", plot_bgcolor="#0b0f14", font_color="#e6eef6")
-        st.plotly_chart(fig_pie, use_container_width=True)
+        # latest record / percent per (Beasiswa, Nama User) and the status counts
+        # are a maintained view, updated on each save (see tracker/progress_view.py)
+        view, view_info = datastore.derived_latest("progress", "latest", LatestProgressView.from_frame,
+                                                   user=active_user, combine=LatestProgressView.merge)
+        freshness(view_info)
+
+        # pie: distribution of statuses across all stages (keyed on the version the view is of)
+        progress_version = view_info["stamp"]
+        def pie_figure():
+            import plotly.express as px
+            fig_pie = px.pie(view.status_dist(), names="Status", values="Jumlah", title="🔵 Distribusi Status (Semua Tahap)")
+            fig_pie.update_layout(paper_bgcolor="#0b0f14", plot_bgcolor="#0b0f14", font_color="#e6eef6")
+            return fig_pie
+        fig_pie = figures.cached("status_pie", progress_version, pie_figure, user=active_user)
+        with metrics.timer("render", part="status_pie"):
+            st.plotly_chart(fig_pie, use_container_width=True)
 
         # percent complete per latest record per (Beasiswa, Nama User)
-        def pct_complete(row):
-            stages = [
-                row.get("Status Pendaftaran",""), row.get("Status Dokumen",""),
-                row.get("Status Wawancara",""), row.get("Status Tes",""), row.get("Status Pengumuman","")
-            ]
-            done = sum(1 for s in stages if str(s).lower()=="selesai")
-            return int(round(done / len(stages) * 100))
-        latest = df_progress.copy()
-        latest["Terakhir Diperbarui_dt"] = pd.to_datetime(latest["Terakhir Diperbarui"], errors="coerce")
-        latest = latest.sort_values("Terakhir Diperbarui_dt").groupby(["Beasiswa","Nama User"]).tail(1)
-        latest["Percent"] = latest.apply(pct_complete, axis=1)
-        avg_pct = latest.groupby("Beasiswa", as_index=False)["Percent"].mean().sort_values("Percent", ascending=False)
+        with metrics.timer("aggregate", view="latest"):
+            avg_pct = view.avg_percent()
         if not avg_pct.empty:
-            fig_bar = px.bar(avg_pct, x="Percent", y="Beasiswa", orientation="h",
-                             title="📊 Rata-rata Percent Progress per Beasiswa", text="Percent",
-                             color="Percent", color_continuous_scale="tealrose")
-            fig_bar.update_layout(paper_bgcolor="#0b0f14", plot_bgcolor="#0b0f14", font_color="#e6eef6", height=420)
-            st.plotly_chart(fig_bar, use_container_width=True)
+            def bar_figure():
+                import plotly.express as px
+                fig_bar = px.bar(avg_pct, x="Percent", y="Beasiswa", orientation="h",
+                                 title="📊 Rata-rata Percent Progress per Beasiswa", text="Percent",
+                                 color="Percent", color_continuous_scale="tealrose")
+                fig_bar.update_layout(paper_bgcolor="#0b0f14", plot_bgcolor="#0b0f14", font_color="#e6eef6", height=420)
+                return fig_bar
+            fig_bar = figures.cached("percent_bar", progress_version, bar_figure, user=active_user)
+            with metrics.timer("render", part="percent_bar"):
+                st.plotly_chart(fig_bar, use_container_width=True)
     else:
         st.info("Belum ada data progress untuk chart.")
 
     # Progress table
     st.markdown("<div class='section-title'>📋 Detail Progress</div>", unsafe_allow_html=True)
-    if not df_progress.empty:
-        df_prog_show = df_progress.copy()
-        df_prog_show = df_prog_show[["Nama User","Beasiswa","Status Pendaftaran","Status Dokumen","Status Wawancara","Status Tes","Status Pengumuman","Terakhir Diperbarui"]]
-        st.markdown(df_prog_show.to_html(escape=False, index=False, classes="data-table"), unsafe_allow_html=True)
-    else:
-        st.info("Belum ada progress yang tercatat.")
+    # filters / paging rerun only this section (fragment), not the charts above it
+    @fragment
+    def progress_table():
+        df_progress = load_json_safely("progress", active_user)  # cache hit; current on fragment reruns
+        if not df_progress.empty:
+            # filter / sort / paginate server-side; only the visible page becomes HTML
+            view, _ = datastore.derived_latest("progress", "latest", LatestProgressView.from_frame,
+                                               user=active_user, combine=LatestProgressView.merge)
+            f1, f2, f3 = st.columns(3)
+            f_users = f1.multiselect("👤 Filter User", view.users(), key="tbl_users")
+            f_beasiswa = f2.multiselect("🎓 Filter Beasiswa", view.scholarships(), key="tbl_beasiswa")
+            f_status = f3.selectbox("📌 Filter Status (tahap mana pun)", [""] + STATUS_VALUES, key="tbl_status")
+            g1, g2, g3, g4 = st.columns(4)
+            sort_by = g1.selectbox("↕️ Urutkan", [""] + PROGRESS_TABLE_COLUMNS, key="tbl_sort")
+            ascending = g2.selectbox("Arah", ["Naik", "Turun"], key="tbl_dir") == "Naik"
+            page_size = g3.selectbox("Baris / halaman", PAGE_SIZES, index=1, key="tbl_page_size")
+            with metrics.timer("aggregate", view="progress_table"):
+                df_prog_show = filter_rows(df_progress, f_users, f_beasiswa, f_status)
+            metrics.count("rows", len(df_progress), step="aggregate", view="progress_table")
+            n_pages = max(1, -(-len(df_prog_show) // page_size))
+            page = g4.number_input("Halaman", min_value=1, max_value=n_pages, value=1, step=1, key="tbl_page")
+            page_df, total, n_pages = page_of(df_prog_show, sort_by, ascending, int(page), page_size)
+            if total:
+                first = (int(page) - 1) * page_size
+                st.caption(f"Menampilkan {first + 1}–{first + len(page_df)} dari {total} baris · halaman {int(page)}/{n_pages}")
+                with metrics.timer("render", part="progress_table"):
+                    st.markdown(render_html(page_df), unsafe_allow_html=True)
+                metrics.count("rows", len(page_df), step="render", part="progress_table")
+            else:
+                st.info("Tidak ada progress yang cocok dengan filter.")
+        else:
+            st.info("Belum ada progress yang tercatat.")
+
+    progress_table()
 
 # ===============================
 # BOTTOM: DELETE utilities (safe)
@@ -340,21 +364,20 @@ with c1:
         to_del = st.selectbox("Hapus Beasiswa (pilih)", [""] + df_scholar["Beasiswa"].tolist(), key="del_bea")
         if st.button("❌ Hapus Beasiswa (aman)"):
             if to_del:
-                df_scholar = df_scholar[df_scholar["Beasiswa"] != to_del]
-                save_json_safely(df_scholar, SCHOLAR_FILE)
-                df_progress = df_progress[df_progress["Beasiswa"] != to_del]
-                save_json_safely(df_progress, PROGRESS_FILE)
+                # with a user selected, only that user's copy is removed
+                datastore.delete("scholar", {"Beasiswa": to_del, **user_match})
+                datastore.delete("progress", {"Beasiswa": to_del, **user_match})
                 st.success(f"Beasiswa '{to_del}' dan progress terkait dihapus.")
                 st.experimental_rerun()
 with c2:
-    if st.button("🔁 Reset All Data (backup dibuat)"):
-        if os.path.exists(SCHOLAR_FILE):
-            shutil.copy(SCHOLAR_FILE, SCHOLAR_FILE + BACKUP_SUFFIX)
-            os.remove(SCHOLAR_FILE)
-        if os.path.exists(PROGRESS_FILE):
-            shutil.copy(PROGRESS_FILE, PROGRESS_FILE + BACKUP_SUFFIX)
-            os.remove(PROGRESS_FILE)
+    if active_user is not None:
+        st.caption("Reset semua data hanya tersedia di tampilan 🌐 Semua User.")
+    elif st.button("🔁 Reset All Data (backup dibuat)"):
+        datastore.reset("scholar")
+        datastore.reset("progress")
         st.success("Semua data di-reset. Backup dibuat.")
         st.experimental_rerun()
 
 st.caption("💡 Dibuat oleh Yan Marcel Sebastian | Scholarship Tracker 6.2 — Info (6.1) + Progress (6.0) merged")
+
+debug_sidebar("scholarship", _t0)
@@ -1,37 +1,36 @@
+import time
+_t0 = time.perf_counter()
+
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import json, os
-from datetime import datetime
+
+# plotly.express is imported inside the figure builder (see 0_Scholarship_Tracker.py)
+from tracker import datastore, editor_sync, figures, metrics, startup
+from tracker.ielts_stats import IeltsStats
+from tracker.schema import empty_df
+from tracker.ui import bulk_panel, debug_sidebar, freshness, user_selector
+startup.imported("ielts", _t0)
+metrics.begin("ielts")
 
 st.set_page_config(page_title="🧠 IELTS Tracker", page_icon="🧠", layout="wide")
 
 st.title("🧠 IELTS Progress Tracker")
 
-DATA_FILE_IELTS = "ielts_data.json"
-
-def load_ielts_data():
-    if os.path.exists(DATA_FILE_IELTS):
-        with open(DATA_FILE_IELTS, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return pd.DataFrame(data)
-    else:
-        return pd.DataFrame(columns=[
-            "Nama User", "Tanggal Tes", "Listening", "Reading", "Writing", "Speaking",
-            "Overall", "Target", "Catatan"
-        ])
-
-def save_ielts_data(df):
-    with open(DATA_FILE_IELTS, "w", encoding="utf-8") as f:
-        json.dump(df.to_dict(orient="records"), f, ensure_ascii=False, indent=2)
+def load_ielts_data(user=None):
+    try:
+        return datastore.load("ielts", user)
+    except datastore.CorruptFileError:
+        st.warning("⚠️ File `ielts_data.json` corrupt — backup dibuat, memulai kosong.")
+        return empty_df("ielts")
 
-df_ielts = load_ielts_data()
+active_user = user_selector()
+df_ielts = load_ielts_data(active_user)
 
 st.markdown("### ➕ Tambahkan Data Tes IELTS Baru")
 
 with st.form("ielts_form", clear_on_submit=True):
     c1, c2 = st.columns(2)
-    nama_user = c1.text_input("👤 Nama User")
+    nama_user = c1.text_input("👤 Nama User", value=active_user or "")
     tanggal = c2.date_input("📅 Tanggal Tes")
 
     c3, c4 = st.columns(2)
@@ -61,48 +60,110 @@ with st.form("ielts_form", clear_on_submit=True):
             "Target": target,
             "Catatan": catatan
         }
-        df_ielts = pd.concat([df_ielts, pd.DataFrame([new_row])], ignore_index=True)
-        save_ielts_data(df_ielts)
+        datastore.insert("ielts", [new_row])
         st.success("✅ Data tes berhasil disimpan!")
         st.rerun()
+bulk_panel("ielts", active_user)
 
 st.divider()
 
 if not df_ielts.empty:
     st.markdown("## 📊 Statistik & Progres IELTS")
 
-    latest = df_ielts.sort_values("Tanggal Tes").iloc[-1]
-    st.metric("📘 Latest Overall", latest["Overall"])
-    st.metric("🎯 Target", latest["Target"])
-    st.metric("📈 Gap", round(latest["Target"] - latest["Overall"], 1))
-
-    df_melt = df_ielts.melt(
-        id_vars=["Tanggal Tes"], 
-        value_vars=["Listening", "Reading", "Writing", "Speaking"],
-        var_name="Skill", 
-        value_name="Score"
-    )
-
-    fig_line = px.line(df_melt, x="Tanggal Tes", y="Score", color="Skill",
+    # per-user latest / best / rolling scores and trend are a maintained view,
+    # updated on each save (see tracker/ielts_stats.py); a save it can't absorb
+    # (editor changes) is rebuilt in the background while the last one is shown
+    stats, stats_info = datastore.derived_latest("ielts", "stats", IeltsStats.from_frame,
+                                                 user=active_user, combine=IeltsStats.merge)
+    if active_user is not None and active_user not in stats.by_user:
+        # the last result predates this user's first test: build it now
+        stats = datastore.derived("ielts", "stats", IeltsStats.from_frame, user=active_user, combine=IeltsStats.merge)
+        stats_info = None
+    freshness(stats_info)
+    with metrics.timer("aggregate", view="stats"):
+        summary_df = stats.summary()
+    if active_user is None:
+        st.dataframe(summary_df, use_container_width=True, hide_index=True)
+        stats_user = st.selectbox("👤 Statistik untuk user", stats.users(),
+                                  format_func=lambda u: u or "(tanpa nama)", key="ielts_stats_user")
+    else:
+        stats_user = active_user
+    summary = summary_df.set_index("Nama User").loc[stats_user]
+    with metrics.timer("aggregate", view="stats"):
+        skills = stats.skills(stats_user)
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("📘 Latest Overall", summary["Overall"])
+    m2.metric("🎯 Target", summary["Target"])
+    m3.metric("📈 Gap", summary["Gap"])
+    m4.metric("🏆 Best Overall", summary["Best Overall"])
+    if summary["Gap"] <= 0:
+        st.caption("🎉 Target sudah tercapai.")
+    elif pd.notna(summary["Proyeksi Target"]):
+        st.caption(f"Tren {summary['Tren / 30 hari']:+.2f} band / 30 hari · "
+                   f"proyeksi mencapai target: **{summary['Proyeksi Target']:%Y-%m-%d}**")
+    st.dataframe(skills, use_container_width=True)
+
+    def line_figure():
+        import plotly.express as px
+        df_user = df_ielts[df_ielts["Nama User"].fillna("").astype(str) == stats_user]
+        df_melt = df_user.sort_values("Tanggal Tes").melt(
+            id_vars=["Tanggal Tes"], 
+            value_vars=["Listening", "Reading", "Writing", "Speaking"],
+            var_name="Skill", 
+            value_name="Score"
+        )
+        return px.line(df_melt, x="Tanggal Tes", y="Score", color="Skill",
                        markers=True, title="📈 Tren Skor per Skill")
-    st.plotly_chart(fig_line, use_container_width=True)
+    fig_line = figures.cached("ielts_line", datastore.stamp("ielts", active_user), line_figure, user=stats_user)
+    with metrics.timer("render", part="ielts_line"):
+        st.plotly_chart(fig_line, use_container_width=True)
 
     st.markdown("### 🚀 Progress vs Target")
-    progress = latest["Overall"] / latest["Target"]
+    progress = summary["Overall"] / summary["Target"]
     st.progress(min(progress, 1.0))
-    st.caption(f"{latest['Overall']} / {latest['Target']}")
+    st.caption(f"{summary['Overall']} / {summary['Target']}")
 
     st.markdown("### 📋 Database IELTS (Editable)")
-    edited_df = st.data_editor(df_ielts, use_container_width=True, hide_index=True)
-    if not edited_df.equals(df_ielts):
-        save_ielts_data(edited_df)
-        st.success("✅ Perubahan disimpan otomatis.")
-        st.rerun()
-
-    avg_scores = df_ielts[["Listening", "Reading", "Writing", "Speaking"]].mean()
-    weakest = avg_scores.idxmin()
-    strongest = avg_scores.idxmax()
-    st.info(f"Skill terbaik kamu: **{strongest} ({avg_scores[strongest]:.1f})**, "
-            f"dan perlu fokus di **{weakest} ({avg_scores[weakest]:.1f})**.")
+    # edits are batched in the editor's state until saved; saving writes only the
+    # changed rows (tracker/editor_sync.py) from the button callback, which runs
+    # before the next rerun, so no st.rerun() is needed
+    editor_gen = st.session_state.get("ielts_editor_gen", 0)
+    editor_key = f"ielts_editor_{editor_gen}"
+
+    def flush_ielts_edits():
+        st.session_state["ielts_saved"] = editor_sync.apply_changes(
+            "ielts", st.session_state["ielts_editor_base"], st.session_state.get(editor_key, {}),
+            defaults={"Nama User": active_user} if active_user else None)
+        st.session_state["ielts_editor_gen"] = editor_gen + 1  # fresh editor on the new data
+
+    def discard_ielts_edits():
+        st.session_state["ielts_editor_gen"] = editor_gen + 1
+
+    saved = st.session_state.pop("ielts_saved", None)
+    if saved is not None:
+        n, total = saved
+        if n == total:
+            st.success("✅ Perubahan disimpan.")
+        else:
+            st.warning(f"⚠️ {n} dari {total} perubahan disimpan; baris lainnya sudah diubah atau dihapus di sesi lain.")
+    st.session_state["ielts_editor_base"] = df_ielts
+    with metrics.timer("render", part="ielts_editor"):
+        st.data_editor(df_ielts, use_container_width=True, hide_index=True, num_rows="dynamic", key=editor_key)
+    metrics.count("rows", len(df_ielts), step="render", part="ielts_editor")
+    n_pending = editor_sync.pending_count(st.session_state.get(editor_key))
+    if n_pending:
+        e1, e2, e3 = st.columns([2, 1, 1])
+        e1.caption(f"✏️ {n_pending} baris berubah, belum disimpan.")
+        e2.button("💾 Simpan perubahan", on_click=flush_ielts_edits, key="ielts_flush")
+        e3.button("↩️ Batalkan", on_click=discard_ielts_edits, key="ielts_discard")
+
+    if summary["Terkuat"]:
+        avg_scores = skills["Rata-rata"]
+        strongest, weakest = summary["Terkuat"], summary["Terlemah"]
+        st.info(f"Skill terbaik kamu: **{strongest} ({avg_scores[strongest]:.1f})**, "
+                f"dan perlu fokus di **{weakest} ({avg_scores[weakest]:.1f})**.")
 else:
     st.info("Belum ada data IELTS.")
+
+debug_sidebar("ielts", _t0)
@@ -0,0 +1,140 @@
+# ===============================
+# Headless benchmark of the load / save / render paths
+# ===============================
+#   python tools/bench.py --sizes 1000,10000,100000 [--backend sqlite] [--snapshot arrow] [--out bench.json]
+#
+# For each size, synthetic scholarships / progress / IELTS rows (tools/
+# synthetic.py) are written to a temp data dir, then every stage a page rerun
+# goes through is timed without starting Streamlit. Each result records wall
+# time and peak traced memory (tracemalloc, which numpy/pandas report to).
+# Tracing slows Python-heavy stages several times over, and unevenly, so
+# every size is run twice on identical data: untraced for the times, then
+# traced for the peaks (skip that pass with --no-memory). The report is JSON
+# so runs can be diffed.
+import argparse, json, os, platform, shutil, sys, tempfile, time, tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from tools import synthetic
+from tracker import backends, datastore, journal
+from tracker.deadlines import DeadlineIndex
+from tracker.gantt import build_gantt
+from tracker.ielts_stats import IeltsStats
+from tracker.progress_view import LatestProgressView
+
+
+class Recorder:
+    """Collects one pass: times (trace=False) or peak memory (trace=True) per stage."""
+
+    def __init__(self, trace):
+        self.trace = trace
+        self.values = {}  # (rows, stage) -> seconds or peak MB
+
+    def __call__(self, n, stage, fn):
+        if self.trace:
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+            out = fn()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.values[(n, stage)] = peak / 2**20
+            return out
+        t0 = time.perf_counter()
+        out = fn()
+        self.values[(n, stage)] = time.perf_counter() - t0
+        return out
+
+
+def run_size(n, backend_kind, measure):
+    root = tempfile.mkdtemp(prefix=f"tracker-bench-{n}-")
+    try:
+        data = {"scholar": synthetic.scholarships(n), "progress": synthetic.progress(n), "ielts": synthetic.ielts(n)}
+        seed = backends.JsonBackend(root)
+        for table, rows in data.items():
+            measure(n, f"write_full:{table}", lambda: seed.replace(table, rows))
+        if backend_kind == "sqlite":
+            backend = measure(n, "sqlite_migrate", lambda: backends.SqliteBackend(os.path.join(root, "tracker.db"), root))
+        else:
+            backend = seed
+        datastore.set_backend(backend)
+
+        frames = {}
+        for table in data:
+            frames[table] = measure(n, f"load_cold:{table}", lambda: backend.load(table))
+        user = backend.users()[0]
+        measure(n, "load_one_user:progress", lambda: backend.load("progress", user))
+        datastore.load("progress")
+        measure(n, "load_cached:progress", lambda: datastore.load("progress"))
+
+        row = dict(data["progress"][0], Catatan="bench")
+        measure(n, "save_one_row:progress", lambda: backend.insert("progress", [row]))
+        if backend_kind == "json":
+            measure(n, "compact:progress", lambda: journal.compact(backend.path("progress", user)))
+
+        df_s, df_p, df_i = frames["scholar"], frames["progress"], frames["ielts"]
+        measure(n, "gantt_build", lambda: build_gantt(df_s))
+        deadlines = measure(n, "deadline_index_build", lambda: DeadlineIndex.from_frame(df_s))
+        measure(n, "deadline_upcoming", lambda: deadlines.upcoming(30, today="2025-03-01"))
+        measure(n, "deadline_open_on", lambda: deadlines.open_on("2025-03-01"))
+        view = measure(n, "latest_view_build", lambda: LatestProgressView.from_frame(df_p))
+        measure(n, "latest_view_insert", lambda: view.insert([row]))
+        measure(n, "percent_avg", lambda: view.avg_percent())
+        measure(n, "status_dist", lambda: view.status_dist())
+        measure(n, "status_melt_full", lambda: df_p.melt(
+            id_vars=["Beasiswa", "Nama User"], value_vars=[c for c in df_p.columns if c.startswith("Status")],
+            var_name="Tahap", value_name="Status").groupby("Status").size())
+        stats = measure(n, "ielts_stats_build", lambda: IeltsStats.from_frame(df_i))
+        measure(n, "ielts_stats_insert", lambda: stats.insert([data["ielts"][0]]))
+        measure(n, "ielts_summary", lambda: stats.summary())
+    finally:
+        datastore.set_backend(None)
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def run(n, backend_kind, memory):
+    """Time pass, then (memory) the traced pass on the same data → result dicts."""
+    passes = [Recorder(trace=False)] + ([Recorder(trace=True)] if memory else [])
+    for recorder in passes:
+        run_size(n, backend_kind, recorder)
+    times, peaks = passes[0].values, passes[-1].values if memory else {}
+    out = []
+    for (rows, stage), seconds in times.items():
+        peak = peaks.get((rows, stage))
+        out.append({"rows": rows, "stage": stage, "seconds": round(seconds, 6),
+                    "peak_mb": None if peak is None else round(peak, 3)})
+        mb = "" if peak is None else f"{peak:9.1f} MB"
+        print(f"{rows:>9} {stage:28s} {seconds:9.4f}s {mb}", file=sys.stderr)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="1000,10000,100000", help="comma-separated row counts (e.g. 1000,...,1000000)")
+    ap.add_argument("--backend", default="json", choices=["json", "sqlite"])
+    ap.add_argument("--snapshot", default="json", choices=["json", "arrow"],
+                    help="TRACKER_SNAPSHOT for the json backend (arrow needs pyarrow)")
+    ap.add_argument("--out", help="write the JSON report here instead of stdout")
+    ap.add_argument("--no-memory", action="store_true", help="skip the traced pass (no peak_mb)")
+    args = ap.parse_args()
+    os.environ["TRACKER_SNAPSHOT"] = args.snapshot
+
+    results = []
+    for n in (int(x) for x in args.sizes.split(",")):
+        results += run(n, args.backend, not args.no_memory)
+    report = {
+        "meta": {"backend": args.backend, "snapshot": args.snapshot, "python": platform.python_version(), "pandas": pd.__version__,
+                 "platform": platform.platform(), "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
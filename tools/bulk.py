@@ -0,0 +1,48 @@
+# ===============================
+# Bulk import / export from the command line (no Streamlit needed)
+# ===============================
+#   python tools/bulk.py import scholar cohort.csv [--user NAME] [--dry-run]
+#   python tools/bulk.py export ielts ielts.xlsx [--user NAME]
+#
+# Goes through the configured backend (TRACKER_BACKEND, TRACKER_DATA_DIR, ...)
+# with the same validation and de-duplication as the pages' import panel
+# (tracker/bulk.py). The format follows the file extension (.csv / .xlsx).
+# Progress goes to stderr, the import report to stdout as JSON.
+import argparse, json, os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tracker import bulk
+from tracker.schema import TABLES
+
+
+def progress(fraction, rows):
+    pct = f"{fraction:6.1%}" if fraction is not None else "   ..."
+    print(f"\r{pct}  {rows} baris", end="", file=sys.stderr, flush=True)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("action", choices=["import", "export"])
+    ap.add_argument("table", choices=list(TABLES))
+    ap.add_argument("path")
+    ap.add_argument("--user", help="import: Nama User for rows without one; export: only this user's rows")
+    ap.add_argument("--dry-run", action="store_true", help="import: validate and report without writing")
+    args = ap.parse_args()
+
+    try:
+        if args.action == "import":
+            report = bulk.import_file(args.table, args.path, defaults={"Nama User": args.user} if args.user else None,
+                                      progress=progress, dry_run=args.dry_run)
+            print(file=sys.stderr)
+            print(json.dumps(report, ensure_ascii=False, indent=1))
+        else:
+            export = bulk.export_csv if bulk.kind_of(args.path) == "csv" else bulk.export_xlsx
+            export(args.table, args.path, user=args.user, progress=progress)
+            print(file=sys.stderr)
+    except bulk.BulkFileError as e:
+        sys.exit(str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# ===============================
+# Upcoming scholarship deadlines from the command line (no Streamlit needed)
+# ===============================
+#   python tools/deadlines.py [--days 30] [--user NAME] [--date YYYY-MM-DD] [--open] [--conflicts]
+#
+# Reads the scholarship table through the configured backend (TRACKER_BACKEND,
+# TRACKER_DATA_DIR, ...) and queries the deadline index the app uses
+# (tracker/deadlines.py). Meant for cron: prints nothing when nothing is due.
+import argparse, os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tracker import datastore
+from tracker.deadlines import DeadlineIndex
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--days", type=int, default=30, help="deadlines closing within this many days")
+    ap.add_argument("--user", help="only this Nama User's scholarships")
+    ap.add_argument("--date", help="count from this day instead of today")
+    ap.add_argument("--open", action="store_true", help="also list phases open on that day")
+    ap.add_argument("--conflicts", action="store_true", help="also list overlapping phases of different scholarships")
+    args = ap.parse_args()
+
+    index = DeadlineIndex.from_frame(datastore.load("scholar", args.user))
+    sections = [("Deadline", index.upcoming(args.days, today=args.date))]
+    if args.open:
+        sections.append(("Sedang dibuka", index.open_on(args.date)))
+    if args.conflicts:
+        sections.append(("Bertabrakan", index.conflicts()))
+    for title, df in sections:
+        if df.empty:
+            continue
+        print(f"== {title} ==")
+        print(df.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# ===============================
+# Regression check for the IELTS editor's row-level saves
+# ===============================
+#   python tools/editor_sync_check.py [--backend json|sqlite|both]
+#
+# Drives tracker/editor_sync.apply_changes() the way the page does (editor
+# deltas on the frame the editor was given) against a fresh temp data dir and
+# checks that the rows really change:
+#   - a row added through the editor with blank cells can be edited and deleted
+#   - a stored row with a missing band score (NULL on SQLite) can be edited and deleted
+#   - a change whose row was deleted elsewhere meanwhile is reported as not saved
+# Exits non-zero on the first failure.
+import argparse, os, shutil, sys, tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tracker import backends, datastore, editor_sync, jobs
+
+USER = "checker"
+
+
+def editor_frame():
+    return datastore.load("ielts", USER)
+
+
+def position(df, date):
+    return int((df["Tanggal Tes"].astype(str).str[:10] == date).to_numpy().nonzero()[0][0])
+
+
+def dates():
+    return sorted(editor_frame()["Tanggal Tes"].astype(str).str[:10])
+
+
+def expect(what, got, want):
+    if got != want:
+        sys.exit(f"FAIL {what}: got {got!r}, want {want!r}")
+
+
+def run(kind):
+    root = tempfile.mkdtemp(prefix=f"tracker-editor-{kind}-")
+    try:
+        backend = backends.SqliteBackend(os.path.join(root, "tracker.db"), json_root=root) if kind == "sqlite" \
+            else backends.JsonBackend(root)
+        datastore.set_backend(backend)
+        defaults = {"Nama User": USER}
+
+        # a stored row without Target / Catatan
+        datastore.insert("ielts", [{"Nama User": USER, "Tanggal Tes": "2024-01-10", "Listening": 6.0,
+                                    "Reading": 6.0, "Writing": 5.5, "Speaking": 6.0, "Overall": 6.0}])
+        # a row added through the editor, Catatan and Target left empty
+        base = editor_frame()
+        added = {"Tanggal Tes": "2024-02-20T00:00:00", "Listening": 7.0, "Reading": 6.5,
+                 "Writing": 6.0, "Speaking": 6.5, "Overall": 6.5, "Catatan": None, "Target": None}
+        expect("add", editor_sync.apply_changes("ielts", base, {"added_rows": [added]}, defaults), (1, 1))
+        expect("rows after add", dates(), ["2024-01-10", "2024-02-20"])
+
+        for date in ("2024-01-10", "2024-02-20"):
+            base = editor_frame()
+            i = position(base, date)
+            changes = {"edited_rows": {i: {"Listening": 8.0}}}
+            expect(f"edit {date}", editor_sync.apply_changes("ielts", base, changes, defaults), (1, 1))
+            row = editor_frame().iloc[position(editor_frame(), date)]
+            expect(f"Listening after edit {date}", float(row["Listening"]), 8.0)
+
+        for date in ("2024-02-20", "2024-01-10"):
+            base = editor_frame()
+            changes = {"deleted_rows": [position(base, date)]}
+            expect(f"delete {date}", editor_sync.apply_changes("ielts", base, changes, defaults), (1, 1))
+            expect(f"row gone {date}", date in dates(), False)
+
+        # the row the editor shows was deleted in another session
+        datastore.insert("ielts", [{"Nama User": USER, "Tanggal Tes": "2024-03-01", "Listening": 5.0}])
+        base = editor_frame()
+        datastore.delete("ielts", {"Nama User": USER, "Tanggal Tes": "2024-03-01"})
+        changes = {"edited_rows": {0: {"Listening": 9.0}}}
+        expect("edit of a deleted row", editor_sync.apply_changes("ielts", base, changes, defaults), (0, 1))
+        expect("rows after edit of a deleted row", dates(), [])
+        jobs.wait()
+        print(f"{kind}: ok")
+    finally:
+        datastore.set_backend(None)
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--backend", choices=["json", "sqlite", "both"], default="both")
+    args = ap.parse_args()
+    for kind in (["json", "sqlite"] if args.backend == "both" else [args.backend]):
+        run(kind)
+
+
+if __name__ == "__main__":
+    main()
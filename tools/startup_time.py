@@ -0,0 +1,89 @@
+# ===============================
+# Worker cold-start timing: imports and first paint of each page
+# ===============================
+#   python tools/startup_time.py [--repeat 3] [--out startup.json]
+#
+# Every measurement runs in a fresh interpreter so nothing is already
+# imported. "import:<module>" is the time to import that module alone;
+# "paint:<page>" runs the page once (cold) and once more (warm) headlessly
+# with streamlit.testing's AppTest and reports the tracker.startup timings of
+# both runs. Medians over --repeat runs; the report is JSON like bench.py's.
+import argparse, json, os, statistics, subprocess, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["streamlit", "pandas", "plotly.express", "pyarrow", "tracker.datastore", "tracker.gantt",
+           "tracker.progress_view", "tracker.ielts_stats", "tracker.deadlines"]
+PAGES = ["0_Scholarship_Tracker.py", "pages/1_IELTS_Tracker.py"]
+
+IMPORT_SNIPPET = """
+import json, time
+t0 = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - t0}}))
+"""
+
+PAINT_SNIPPET = """
+import json
+from streamlit.testing.v1 import AppTest
+from tracker import startup
+app = AppTest.from_file({page!r}, default_timeout=120)
+app.run()
+app.run()
+name = next(iter(startup.cold))
+print(json.dumps({{"cold": startup.cold[name], "warm": startup.warm.get(name)}}))
+"""
+
+
+def run(snippet):
+    out = subprocess.run([sys.executable, "-c", snippet], cwd=ROOT, capture_output=True, text=True,
+                         env=dict(os.environ, PYTHONPATH=ROOT))
+    if out.returncode:
+        return None, out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "failed"
+    return json.loads(out.stdout.strip().splitlines()[-1]), None
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", help="write the JSON report here instead of stdout")
+    args = ap.parse_args()
+
+    results = []
+    for module in MODULES:
+        runs, err = [], None
+        for _ in range(args.repeat):
+            r, err = run(IMPORT_SNIPPET.format(module=module))
+            if r is None:
+                break
+            runs.append(r["seconds"])
+        results.append({"stage": f"import:{module}", "seconds": round(statistics.median(runs), 4) if runs else None,
+                        **({"error": err} if err else {})})
+        print(f"import:{module:28s} {results[-1]['seconds']}", file=sys.stderr)
+    for page in PAGES:
+        runs, err = [], None
+        for _ in range(args.repeat):
+            r, err = run(PAINT_SNIPPET.format(page=page))
+            if r is None:
+                break
+            runs.append(r)
+        entry = {"stage": f"paint:{page}"}
+        if runs:
+            for kind in ("cold", "warm"):
+                for part in ("imports", "paint"):
+                    vals = [r[kind][part] for r in runs if r.get(kind)]
+                    entry[f"{kind}_{part}"] = round(statistics.median(vals), 4) if vals else None
+        else:
+            entry["error"] = err
+        results.append(entry)
+        print(json.dumps(entry), file=sys.stderr)
+
+    text = json.dumps({"python": sys.version.split()[0], "results": results}, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
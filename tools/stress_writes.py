@@ -0,0 +1,75 @@
+# ===============================
+# Concurrency stress check for the storage layer (no Streamlit needed)
+# ===============================
+#   python tools/stress_writes.py --procs 4 --threads 4 --rows 50 [--backend sqlite]
+#
+# Every writer thread (in several processes) inserts its own uniquely tagged
+# progress rows and also does whole-table IELTS saves from a possibly stale
+# read (datastore.replace with base=...), the path that used to lose updates.
+# Compaction is forced to run often. Exits non-zero if any row went missing.
+import argparse, os, sys, tempfile, threading, time
+from multiprocessing import Process
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from tracker import datastore, journal
+
+
+def writer(proc, threads, rows):
+    journal.COMPACT_BYTES = 4096  # compact constantly while others append
+
+    def run(t):
+        for i in range(rows):
+            tag = f"{proc}-{t}-{i}"
+            datastore.insert("progress", [{"Nama User": f"u{proc}", "Beasiswa": f"b{t}", "Catatan": tag,
+                                           "Terakhir Diperbarui": "2025-01-01"}])
+            base = datastore.load("ielts")
+            time.sleep(0.0005)  # widen the stale-read window
+            edited = pd.concat([base, pd.DataFrame([{"Nama User": f"u{proc}", "Catatan": tag}])], ignore_index=True)
+            datastore.replace("ielts", edited, base=base)
+
+    ts = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--procs", type=int, default=4)
+    ap.add_argument("--threads", type=int, default=4)
+    ap.add_argument("--rows", type=int, default=50)
+    ap.add_argument("--backend", default="json", choices=["json", "sqlite"])
+    args = ap.parse_args()
+
+    root = tempfile.mkdtemp(prefix="tracker-stress-")
+    os.environ.update(TRACKER_DATA_DIR=root, TRACKER_BACKEND=args.backend)
+    datastore.set_backend(None)
+    datastore.load("progress")  # create tables / files before forking
+
+    t0 = time.perf_counter()
+    procs = [Process(target=writer, args=(p, args.threads, args.rows)) for p in range(args.procs)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    elapsed = time.perf_counter() - t0
+
+    datastore.invalidate()
+    expected = {f"{p}-{t}-{i}" for p in range(args.procs) for t in range(args.threads) for i in range(args.rows)}
+    ok = True
+    for table in ("progress", "ielts"):
+        tags = datastore.load(table)["Catatan"].tolist()
+        missing = expected - set(tags)
+        dupes = len(tags) - len(set(tags))
+        print(f"{table:9s} rows={len(tags)} expected={len(expected)} missing={len(missing)} duplicated={dupes}")
+        ok &= not missing and not dupes
+    print(f"{args.backend}: {len(expected) * 2} writes in {elapsed:.1f}s ({root})")
+    sys.exit(0 if ok and all(p.exitcode == 0 for p in procs) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# ===============================
+# Synthetic tracker data in the app's JSON schemas
+# ===============================
+# Used by tools/bench.py; deterministic for a given seed.
+import random
+from datetime import date, timedelta
+
+from tracker.gantt import PHASES
+from tracker.schema import IELTS_SKILLS, STATUS_COLUMNS, STATUS_VALUES
+
+COUNTRIES = ["United Kingdom","Australia","Netherlands","Germany","Japan","United States","Korea","Sweden"]
+PROGRAMS = ["Chevening","LPDP","AAS","StuNed","DAAD","MEXT","Fulbright","GKS","SI"]
+
+
+def n_users(n):
+    return max(1, min(1000, n // 100))
+
+
+def _day(rng, start=date(2024, 1, 1), span=730):
+    return start + timedelta(days=rng.randrange(span))
+
+
+def scholarships(n, seed=0):
+    rng = random.Random(seed)
+    users = n_users(n)
+    rows = []
+    for i in range(n):
+        row = {
+            "Nama User": f"user{i % users:04d}", "Negara": rng.choice(COUNTRIES),
+            "Beasiswa": f"{rng.choice(PROGRAMS)} {i}", "Link Beasiswa": "",
+            "IELTS": "6.5 overall", "GPA": "3.0 / 4.0",
+            "Other Requirements": "", "Benefit Scholarship": "",
+        }
+        for _, sc, ec in PHASES:
+            if rng.random() < 0.8:
+                start = _day(rng)
+                row[sc] = str(start)
+                row[ec] = str(start + timedelta(days=rng.randrange(1, 60))) if ec != sc else row[sc]
+            else:
+                row[sc] = row[ec] = ""
+        rows.append(row)
+    return rows
+
+
+def progress(n, n_scholarships=None, seed=1):
+    rng = random.Random(seed)
+    users = n_users(n)
+    n_scholarships = n_scholarships or max(1, n // 10)
+    rows = []
+    for i in range(n):
+        b = rng.randrange(n_scholarships)
+        rows.append({
+            "Nama User": f"user{b % users:04d}", "Beasiswa": f"{PROGRAMS[b % len(PROGRAMS)]} {b}",
+            **{c: rng.choice(STATUS_VALUES) for c in STATUS_COLUMNS},
+            "Catatan": "", "Terakhir Diperbarui": str(_day(rng)),
+        })
+    return rows
+
+
+def ielts(n, seed=2):
+    rng = random.Random(seed)
+    users = n_users(n)
+    rows = []
+    for i in range(n):
+        scores = {s: rng.randrange(8, 19) / 2 for s in IELTS_SKILLS}
+        rows.append({
+            "Nama User": f"user{i % users:04d}", "Tanggal Tes": str(_day(rng)), **scores,
+            "Overall": round(sum(scores.values()) / 4, 1), "Target": rng.choice([6.5, 7.0, 7.5]), "Catatan": "",
+        })
+    return rows
@@ -0,0 +1 @@
+# Shared helpers for the Scholarship Tracker pages (storage, caching, analytics).
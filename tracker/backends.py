@@ -0,0 +1,684 @@
+# ===============================
+# Storage backends
+# ===============================
+# Every backend offers the same row-level operations on the three tables
+# ("scholar", "progress", "ielts"):
+#
+#   load(table, user) -> DataFrame    stamp(table, user) -> cache token
+#   find(table, match)*               insert(table, rows)
+#   update(table, match, values)      delete(table, match)
+#   replace(table, rows, base)        reset(table)
+#   users() -> list of "Nama User" values with data
+#
+# user=None means every user; otherwise only that user's partition is read.
+# load() stamps the frame with df.attrs["version"] / ["user"]. Passing that frame as
+# `base` to replace() makes the save optimistic: if the table moved on since,
+# the edit is merged onto the current rows (concurrency.merge_rows).
+#
+# `match` is a {column: value} equality filter; a blank value ("") also
+# matches a missing / NULL cell. (*) only on backends with `indexed = True`;
+# otherwise the datastore filters its cached frame. update() / delete() return
+# the number of rows they changed, or None where that isn't known without
+# re-reading the table (JSON; the datastore counts on its cached frame).
+#
+# The backend is picked with TRACKER_BACKEND=json (default: journaled JSON
+# files) or TRACKER_BACKEND=sqlite (a local file, TRACKER_DB, default
+# tracker.db; the JSON files are imported once on first use). On the JSON
+# backend, TRACKER_SNAPSHOT=arrow adds typed columnar snapshots
+# (tracker/columnar.py) and load() returns typed frames.
+import os, shutil, sqlite3, threading
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+
+from tracker import backups, columnar, journal
+from tracker.concurrency import locked, merge_rows
+from tracker.schema import TABLES, clean_record, clean_value, conform, empty_df, group_by_user, to_frame, user_of
+
+BACKUP_SUFFIX = "_backup.json"  # copy of a shard that failed to parse
+
+
+class CorruptFileError(Exception):
+    pass
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+# -------------------------------
+# JSON snapshot + journal (tracker/journal.py), one shard per user
+# -------------------------------
+# <root>/users/<quoted Nama User>/data_scholarship.json (+ .log, .lock) ...
+# A session working as one user only reads and parses that user's files; the
+# all-users view is the concatenation of the shards. Rows with an empty
+# "Nama User" live in the "(none)" shard. Legacy monolithic files in <root>
+# are split into shards once, then renamed to <file>.migrated.
+USERS_DIR = "users"
+NO_USER_SHARD = "(none)"  # quote() never produces parentheses, so no clash
+MIGRATED_SUFFIX = ".migrated"
+
+
+def shard_name(user):
+    if not user:
+        return NO_USER_SHARD
+    if user.strip(".") == "":
+        return user.replace(".", "%2E")  # "." / ".." would name users/ or the root itself
+    return quote(user, safe="")
+
+
+class JsonBackend:
+    name = "json"
+    indexed = False  # find() is served from the cached frame instead
+    partitioned = True
+
+    def __init__(self, root="."):
+        self.root = root
+        self.users_root = os.path.join(root, USERS_DIR)
+        self._split_monolithic()
+        self._sweep_backups()
+
+    def path(self, table, user):
+        return os.path.join(self.users_root, shard_name(user), TABLES[table][0])
+
+    def users(self):
+        try:
+            names = [e.name for e in os.scandir(self.users_root) if e.is_dir()]
+        except FileNotFoundError:
+            return []
+        return sorted("" if n == NO_USER_SHARD else unquote(n) for n in names)
+
+    def stamp(self, table, user=None):
+        if user is None:
+            return tuple((u, self.stamp(table, u)) for u in self.users())
+        path = self.path(table, user)
+        return (_stat(path), _stat(journal.journal_path(path)))
+
+    def load(self, table, user=None):
+        typed = columnar.enabled()
+        if user is None:
+            users = self.users()
+            frames = [self.load(table, u) for u in users]
+            if typed:
+                df = columnar.concat(table, frames)
+            else:
+                # an empty shard's object columns would turn the numbers into objects
+                filled = [f for f in frames if len(f)]
+                df = pd.concat(filled, ignore_index=True) if filled else empty_df(table)
+            df.attrs.update(version={u: f.attrs["version"] for u, f in zip(users, frames)}, user=None)
+            return df
+        path = self.path(table, user)
+        if self.stamp(table, user) == (None, None):
+            df = columnar.empty(table) if typed else empty_df(table)
+            df.attrs.update(version=0, user=user)
+            return df
+        try:
+            if typed:
+                df, seq = journal.load_frame(path, table)
+            else:
+                rows, seq = journal.load_records(path)
+                df = to_frame(table, rows)
+        except ValueError:
+            try:
+                shutil.copy(path, path + BACKUP_SUFFIX)
+            except OSError:
+                pass
+            raise CorruptFileError(path)
+        df.attrs.update(version=seq, user=user)
+        return df
+
+    def _shard_path(self, table, user):
+        path = self.path(table, user)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def _targets(self, table, match):
+        # shards a match can touch: its own user, or every shard holding a hit
+        # (a re-read of each shard; the datastore puts the user in the match
+        # from its cached frame, so only direct callers end up scanning)
+        if "Nama User" in match:
+            return [user_of(match)]
+        out = []
+        for u in self.users():
+            rows, _ = journal.load_records(self.path(table, u))
+            if any(journal.matches(r, clean_record(match)) for r in rows):
+                out.append(u)
+        return out
+
+    def insert(self, table, rows):
+        for user, group in group_by_user(rows).items():
+            journal.append_rows(self._shard_path(table, user), group)
+
+    def update(self, table, match, values):
+        for user in self._targets(table, match):
+            path = self.path(table, user)
+            if "Nama User" in values and user_of(values) != user:
+                # the row changes owner: move it to the other shard
+                with locked(path):
+                    rows, _ = journal.load_records(path)
+                    moved = [dict(r, **clean_record(values)) for r in rows if journal.matches(r, clean_record(match))]
+                    journal.delete_rows(path, match)
+                self.insert(table, moved)
+            else:
+                journal.update_rows(path, match, values)
+
+    def delete(self, table, match):
+        for user in self._targets(table, match):
+            journal.delete_rows(self.path(table, user), match)
+
+    def replace(self, table, rows, base=None):
+        """Whole-table save, shard by shard.
+
+        With a base frame only the shards it covered (plus shards rows were
+        moved into) are rewritten, each merged if it changed since the base was
+        read. Without one, every shard is replaced.
+        """
+        columns = TABLES[table][1]
+        groups = group_by_user(rows)
+        if base is None:
+            for user in set(self.users()) | set(groups):
+                journal.replace_rows(self._shard_path(table, user), groups.get(user, []))
+            return
+        base_groups = group_by_user(base.to_dict(orient="records"))
+        version = base.attrs.get("version")
+        covered = set(version) if isinstance(version, dict) else {base.attrs.get("user")}
+        for user in (covered - {None}) | set(groups) | set(base_groups):
+            if isinstance(version, dict):
+                seq = version.get(user, -1)
+            else:
+                seq = version if user == base.attrs.get("user") else -1
+            # seq -1 never matches, so a shard the base didn't cover is merged (appended to)
+            journal.replace_rows(self._shard_path(table, user), groups.get(user, []),
+                                 base_groups.get(user, []), seq, columns)
+
+    def reset(self, table):
+        # the shard's files are only renamed here; the worker replays and
+        # compresses them into backups/ (tracker/backups.py)
+        stamp = backups.new_stamp()
+        for user in self.users():
+            path = self.path(table, user)
+            with locked(path):
+                columnar.remove(path)
+                staged = backups.stage(path, stamp)
+            if staged:
+                backups.schedule_staged(self.root, table, stamp, shard_name(user), staged)
+
+    def _sweep_backups(self):
+        try:
+            shards = {e.name: e.path for e in os.scandir(self.users_root) if e.is_dir()}
+        except FileNotFoundError:
+            return
+        backups.sweep(self.root, shards, {fname: t for t, (fname, _, _) in TABLES.items()})
+
+    def _split_monolithic(self):
+        for table, (fname, _, _) in TABLES.items():
+            path = os.path.join(self.root, fname)
+            jpath = journal.journal_path(path)
+            if not (os.path.exists(path) or os.path.exists(jpath)):
+                continue
+            with locked(path):
+                if not (os.path.exists(path) or os.path.exists(jpath)):
+                    continue  # another worker got here first
+                rows, _ = journal.load_records(path)
+                # plain replace, so re-running after a crash mid-split is harmless
+                for user, group in group_by_user(rows).items():
+                    journal.replace_rows(self._shard_path(table, user), group)
+                for p in (path, jpath):
+                    if os.path.exists(p):
+                        os.replace(p, p + MIGRATED_SUFFIX)
+
+
+# -------------------------------
+# SQLite (indexed, row-level writes)
+# -------------------------------
+INDEXES = {
+    "scholar": [["Beasiswa"], ["Nama User", "Beasiswa"]],
+    "progress": [["Beasiswa", "Nama User", "Terakhir Diperbarui"], ["Nama User"]],
+    "ielts": [["Nama User", "Tanggal Tes"]],
+}
+
+
+def _q(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _where(match, table=None):
+    # IS rather than =, so a blank number (NULL) matches too
+    if not match:
+        return "", []
+    numeric = TABLES[table][2] if table else ()
+    params = [None if v == "" and k in numeric else v for k, v in match.items()]
+    return " WHERE " + " AND ".join(f"{_q(k)} IS ?" for k in match), params
+
+
+class SqliteBackend:
+    name = "sqlite"
+    indexed = True
+    partitioned = False  # "Nama User" is an indexed column instead of a shard
+
+    def __init__(self, db_path="tracker.db", json_root="."):
+        self.db_path = db_path
+        self.json_root = json_root
+        self._local = threading.local()
+        self._users = None  # (table versions, users) — users() runs on every rerun
+        self._setup()
+
+    def conn(self):
+        # sqlite3 connections can't be shared across threads; Streamlit runs
+        # each session in its own thread
+        c = getattr(self._local, "conn", None)
+        if c is None:
+            c = sqlite3.connect(self.db_path, timeout=30)
+            c.execute("PRAGMA journal_mode=WAL")
+            c.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = c
+        return c
+
+    def _setup(self):
+        c = self.conn()
+        with c:
+            c.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            for table, (_, columns, numeric) in TABLES.items():
+                cols = ", ".join(f"{_q(col)} {'REAL' if col in numeric else 'TEXT'}" for col in columns)
+                c.execute(f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY AUTOINCREMENT, {cols})")
+                for i, idx in enumerate(INDEXES[table]):
+                    c.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_{i} ON {table} ({', '.join(map(_q, idx))})")
+        for table in TABLES:
+            self._migrate(table)
+
+    def _migrate(self, table):
+        """One-time import of the JSON data (monolithic files or user shards)."""
+        c = self.conn()
+        flag = "SELECT 1 FROM meta WHERE key = ?", (f"migrated:{table}",)
+        if c.execute(*flag).fetchone():
+            return
+        rows = JsonBackend(self.json_root).load(table).to_dict(orient="records")
+        with c:
+            c.execute("BEGIN IMMEDIATE")  # several processes may start on a new DB at once
+            if c.execute(*flag).fetchone():
+                return
+            self._insert(c, table, rows)
+            self._bump(c, table)
+            c.execute("INSERT OR REPLACE INTO meta VALUES (?, 1)", (f"migrated:{table}",))
+
+    def _bump(self, c, table, users=None):
+        # version:<table> moves on every write; a write confined to some users
+        # also moves their version:<table>:u:<user>, anything wider the
+        # version:<table>:* every user's stamp includes
+        keys = [f"version:{table}"] + ([f"version:{table}:*"] if users is None else
+                                       [f"version:{table}:u:{u}" for u in set(users)])
+        c.executemany("INSERT INTO meta VALUES (?, 1) ON CONFLICT(key) DO UPDATE SET value = value + 1",
+                      [(k,) for k in keys])
+
+    def _users_of(self, c, table, where, params):
+        return [r[0] or "" for r in c.execute(f'SELECT DISTINCT "Nama User" FROM {table}{where}', params)]
+
+    def _cells(self, table, row, columns):
+        # missing numbers are NULL in their REAL columns, not ""
+        numeric = TABLES[table][2]
+        cells = [clean_value(row.get(col, "")) for col in columns]
+        return [None if v == "" and col in numeric else v for col, v in zip(columns, cells)]
+
+    def _insert(self, c, table, rows):
+        columns = TABLES[table][1]
+        sql = f"INSERT INTO {table} ({', '.join(map(_q, columns))}) VALUES ({', '.join('?' * len(columns))})"
+        c.executemany(sql, (self._cells(table, r, columns) for r in rows))
+
+    def _version(self, c, table):
+        row = c.execute("SELECT value FROM meta WHERE key = ?", (f"version:{table}",)).fetchone()
+        return row[0] if row else 0
+
+    def stamp(self, table, user=None):
+        if user is None:
+            return (self.db_path, self._version(self.conn(), table))
+        keys = (f"version:{table}:*", f"version:{table}:u:{user}")
+        got = dict(self.conn().execute("SELECT key, value FROM meta WHERE key IN (?, ?)", keys).fetchall())
+        return (self.db_path, user, got.get(keys[0], 0), got.get(keys[1], 0))
+
+    def users(self):
+        c = self.conn()
+        keys = [f"version:{t}" for t in TABLES]
+        versions = tuple(sorted(c.execute(f"SELECT key, value FROM meta WHERE key IN ({', '.join('?' * len(keys))})",
+                                          keys).fetchall()))
+        cached = self._users
+        if cached is None or cached[0] != versions:
+            sql = " UNION ".join(f'SELECT "Nama User" FROM {t}' for t in TABLES)
+            cached = self._users = (versions, sorted(str(r[0]) for r in c.execute(sql) if r[0] is not None))
+        return list(cached[1])
+
+    def _query(self, table, match=None):
+        where, params = _where(match, table)
+        return f"SELECT {', '.join(map(_q, TABLES[table][1]))} FROM {table}{where} ORDER BY id", params
+
+    def _select(self, table, match=None):
+        sql, params = self._query(table, match)
+        df = pd.read_sql_query(sql, self.conn(), params=params)
+        return empty_df(table) if df.empty else conform(table, df)
+
+    def load(self, table, user=None):
+        version = self._version(self.conn(), table)  # read first: an older version only costs a merge
+        df = self._select(table, None if user is None else {"Nama User": user})
+        df.attrs.update(version=version, user=user)
+        return df
+
+    def find(self, table, match):
+        # point lookups: read_sql_query + per-column inference cost ~2 ms a call, so
+        # build the frame from the cursor rows, text inferred once as one flat array
+        _, columns, numeric = TABLES[table]
+        rows = self.conn().execute(*self._query(table, match)).fetchall()
+        if not rows:
+            return empty_df(table)
+        cells, n = np.array(rows, dtype=object).T, len(rows)
+        text = [i for i, col in enumerate(columns) if col not in numeric]
+        strings = pd.Series(cells[text].ravel()).array
+        data = {}
+        for i, col in enumerate(columns):
+            if col not in numeric:
+                j = text.index(i)
+                data[col] = strings[j * n:(j + 1) * n]
+                continue
+            try:
+                data[col] = cells[i].astype(float)  # NULL → NaN
+            except (TypeError, ValueError):  # text left in a REAL column
+                data[col] = pd.to_numeric(pd.Series(cells[i]), errors="coerce").to_numpy()
+        return pd.DataFrame(data, copy=False)
+
+    def insert(self, table, rows):
+        for user, group in group_by_user(rows).items():
+            journal.append_rows(self._shard_path(table, user), group)
+
+    def update(self, table, match, values):
+        for user in self._targets(table, match):
+            path = self.path(table, user)
+            if "Nama User" in values and user_of(values) != user:
+                # the row changes owner: move it to the other shard
+                with locked(path):
+                    rows, _ = journal.load_records(path)
+                    moved = [dict(r, **clean_record(values)) for r in rows if journal.matches(r, clean_record(match))]
+                    journal.delete_rows(path, match)
+                self.insert(table, moved)
+            else:
+                journal.update_rows(path, match, values)
+
+    def delete(self, table, match):
+        for user in self._targets(table, match):
+            journal.delete_rows(self.path(table, user), match)
+
+    def replace(self, table, rows, base=None):
+        """Whole-table save, shard by shard.
+
+        With a base frame only the shards it covered (plus shards rows were
+        moved into) are rewritten, each merged if it changed since the base was
+        read. Without one, every shard is replaced.
+        """
+        columns = TABLES[table][1]
+        groups = group_by_user(rows)
+        if base is None:
+            for user in set(self.users()) | set(groups):
+                journal.replace_rows(self._shard_path(table, user), groups.get(user, []))
+            return
+        base_groups = group_by_user(base.to_dict(orient="records"))
+        version = base.attrs.get("version")
+        covered = set(version) if isinstance(version, dict) else {base.attrs.get("user")}
+        for user in (covered - {None}) | set(groups) | set(base_groups):
+            if isinstance(version, dict):
+                seq = version.get(user, -1)
+            else:
+                seq = version if user == base.attrs.get("user") else -1
+            # seq -1 never matches, so a shard the base didn't cover is merged (appended to)
+            journal.replace_rows(self._shard_path(table, user), groups.get(user, []),
+                                 base_groups.get(user, []), seq, columns)
+
+    def reset(self, table):
+        # the shard's files are only renamed here; the worker replays and
+        # compresses them into backups/ (tracker/backups.py)
+        stamp = backups.new_stamp()
+        for user in self.users():
+            path = self.path(table, user)
+            with locked(path):
+                columnar.remove(path)
+                staged = backups.stage(path, stamp)
+            if staged:
+                backups.schedule_staged(self.root, table, stamp, shard_name(user), staged)
+
+    def _sweep_backups(self):
+        try:
+            shards = {e.name: e.path for e in os.scandir(self.users_root) if e.is_dir()}
+        except FileNotFoundError:
+            return
+        backups.sweep(self.root, shards, {fname: t for t, (fname, _, _) in TABLES.items()})
+
+    def _split_monolithic(self):
+        for table, (fname, _, _) in TABLES.items():
+            path = os.path.join(self.root, fname)
+            jpath = journal.journal_path(path)
+            if not (os.path.exists(path) or os.path.exists(jpath)):
+                continue
+            with locked(path):
+                if not (os.path.exists(path) or os.path.exists(jpath)):
+                    continue  # another worker got here first
+                rows, _ = journal.load_records(path)
+                # plain replace, so re-running after a crash mid-split is harmless
+                for user, group in group_by_user(rows).items():
+                    journal.replace_rows(self._shard_path(table, user), group)
+                for p in (path, jpath):
+                    if os.path.exists(p):
+                        os.replace(p, p + MIGRATED_SUFFIX)
+
+
+# -------------------------------
+# SQLite (indexed, row-level writes)
+# -------------------------------
+INDEXES = {
+    "scholar": [["Beasiswa"], ["Nama User", "Beasiswa"]],
+    "progress": [["Beasiswa", "Nama User", "Terakhir Diperbarui"], ["Nama User"]],
+    "ielts": [["Nama User", "Tanggal Tes"]],
+}
+
+
+def _q(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _where(match, table=None):
+    # IS rather than =, so a blank number (NULL) matches too
+    if not match:
+        return "", []
+    numeric = TABLES[table][2] if table else ()
+    params = [None if v == "" and k in numeric else v for k, v in match.items()]
+    return " WHERE " + " AND ".join(f"{_q(k)} IS ?" for k in match), params
+
+
+class SqliteBackend:
+    name = "sqlite"
+    indexed = True
+    partitioned = False  # "Nama User" is an indexed column instead of a shard
+
+    def __init__(self, db_path="tracker.db", json_root="."):
+        self.db_path = db_path
+        self.json_root = json_root
+        self._local = threading.local()
+        self._users = None  # (table versions, users) — users() runs on every rerun
+        self._setup()
+
+    def conn(self):
+        # sqlite3 connections can't be shared across threads; Streamlit runs
+        # each session in its own thread
+        c = getattr(self._local, "conn", None)
+        if c is None:
+            c = sqlite3.connect(self.db_path, timeout=30)
+            c.execute("PRAGMA journal_mode=WAL")
+            c.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = c
+        return c
+
+    def _setup(self):
+        c = self.conn()
+        with c:
+            c.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            for table, (_, columns, numeric) in TABLES.items():
+                cols = ", ".join(f"{_q(col)} {'REAL' if col in numeric else 'TEXT'}" for col in columns)
+                c.execute(f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY AUTOINCREMENT, {cols})")
+                for i, idx in enumerate(INDEXES[table]):
+                    c.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_{i} ON {table} ({', '.join(map(_q, idx))})")
+        for table in TABLES:
+            self._migrate(table)
+
+    def _migrate(self, table):
+        """One-time import of the JSON data (monolithic files or user shards)."""
+        c = self.conn()
+        flag = "SELECT 1 FROM meta WHERE key = ?", (f"migrated:{table}",)
+        if c.execute(*flag).fetchone():
+            return
+        rows = JsonBackend(self.json_root).load(table).to_dict(orient="records")
+        with c:
+            c.execute("BEGIN IMMEDIATE")  # several processes may start on a new DB at once
+            if c.execute(*flag).fetchone():
+                return
+            self._insert(c, table, rows)
+            self._bump(c, table)
+            c.execute("INSERT OR REPLACE INTO meta VALUES (?, 1)", (f"migrated:{table}",))
+
+    def _bump(self, c, table, users=None):
+        # version:<table> moves on every write; a write confined to some users
+        # also moves their version:<table>:u:<user>, anything wider the
+        # version:<table>:* every user's stamp includes
+        keys = [f"version:{table}"] + ([f"version:{table}:*"] if users is None else
+                                       [f"version:{table}:u:{u}" for u in set(users)])
+        c.executemany("INSERT INTO meta VALUES (?, 1) ON CONFLICT(key) DO UPDATE SET value = value + 1",
+                      [(k,) for k in keys])
+
+    def _users_of(self, c, table, where, params):
+        return [r[0] or "" for r in c.execute(f'SELECT DISTINCT "Nama User" FROM {table}{where}', params)]
+
+    def _cells(self, table, row, columns):
+        # missing numbers are NULL in their REAL columns, not ""
+        numeric = TABLES[table][2]
+        cells = [clean_value(row.get(col, "")) for col in columns]
+        return [None if v == "" and col in numeric else v for col, v in zip(columns, cells)]
+
+    def _insert(self, c, table, rows):
+        columns = TABLES[table][1]
+        sql = f"INSERT INTO {table} ({', '.join(map(_q, columns))}) VALUES ({', '.join('?' * len(columns))})"
+        c.executemany(sql, (self._cells(table, r, columns) for r in rows))
+
+    def _version(self, c, table):
+        row = c.execute("SELECT value FROM meta WHERE key = ?", (f"version:{table}",)).fetchone()
+        return row[0] if row else 0
+
+    def stamp(self, table, user=None):
+        if user is None:
+            return (self.db_path, self._version(self.conn(), table))
+        keys = (f"version:{table}:*", f"version:{table}:u:{user}")
+        got = dict(self.conn().execute("SELECT key, value FROM meta WHERE key IN (?, ?)", keys).fetchall())
+        return (self.db_path, user, got.get(keys[0], 0), got.get(keys[1], 0))
+
+    def users(self):
+        c = self.conn()
+        keys = [f"version:{t}" for t in TABLES]
+        versions = tuple(sorted(c.execute(f"SELECT key, value FROM meta WHERE key IN ({', '.join('?' * len(keys))})",
+                                          keys).fetchall()))
+        cached = self._users
+        if cached is None or cached[0] != versions:
+            sql = " UNION ".join(f'SELECT "Nama User" FROM {t}' for t in TABLES)
+            cached = self._users = (versions, sorted(str(r[0]) for r in c.execute(sql) if r[0] is not None))
+        return list(cached[1])
+
+    def _query(self, table, match=None):
+        where, params = _where(match, table)
+        return f"SELECT {', '.join(map(_q, TABLES[table][1]))} FROM {table}{where} ORDER BY id", params
+
+    def _select(self, table, match=None):
+        sql, params = self._query(table, match)
+        df = pd.read_sql_query(sql, self.conn(), params=params)
+        return empty_df(table) if df.empty else conform(table, df)
+
+    def load(self, table, user=None):
+        version = self._version(self.conn(), table)  # read first: an older version only costs a merge
+        df = self._select(table, None if user is None else {"Nama User": user})
+        df.attrs.update(version=version, user=user)
+        return df
+
+    def find(self, table, match):
+        # point lookups: read_sql_query and str inference cost ~1 ms a call, so build
+        # the frame from the cursor rows; text stays as stored (object), numbers go float
+        _, columns, numeric = TABLES[table]
+        rows = self.conn().execute(*self._query(table, match)).fetchall()
+        if not rows:
+            return empty_df(table)
+        data = {}
+        for col, cells in zip(columns, zip(*rows)):
+            if col not in numeric:
+                data[col] = np.array(cells, dtype=object)
+                continue
+            try:
+                data[col] = np.array(cells, dtype=float)  # NULL → NaN
+            except (TypeError, ValueError):  # text left in a REAL column
+                data[col] = pd.to_numeric(pd.Series(cells, dtype=object), errors="coerce").to_numpy()
+        return pd.DataFrame(data)
+
+    def insert(self, table, rows):
+        c = self.conn()
+        with c:
+            self._insert(c, table, rows)
+            self._bump(c, table, [user_of(r) for r in rows])
+
+    def update(self, table, match, values):
+        where, params = _where(clean_record(match), table)
+        sets = ", ".join(f"{_q(k)} = ?" for k in values)
+        c = self.conn()
+        with c:
+            c.execute("BEGIN IMMEDIATE")
+            users = self._users_of(c, table, where, params) + ([user_of(values)] if "Nama User" in values else [])
+            n = c.execute(f"UPDATE {table} SET {sets}{where}", self._cells(table, values, list(values)) + params).rowcount
+            self._bump(c, table, users)
+        return n
+
+    def delete(self, table, match):
+        where, params = _where(clean_record(match), table)
+        c = self.conn()
+        with c:
+            c.execute("BEGIN IMMEDIATE")
+            users = self._users_of(c, table, where, params)
+            n = c.execute(f"DELETE FROM {table}{where}", params).rowcount
+            self._bump(c, table, users)
+        return n
+
+    def replace(self, table, rows, base=None):
+        # a base loaded for one user only rewrites that user's rows
+        user = None if base is None else base.attrs.get("user")
+        scope = None if user is None else {"Nama User": user}
+        where, params = _where(scope)
+        c = self.conn()
+        with c:
+            c.execute("BEGIN IMMEDIATE")  # take the write lock before checking the version
+            if base is not None and base.attrs.get("version") != self._version(c, table):
+                current = self._select(table, scope).to_dict(orient="records")
+                rows = merge_rows(current, base.to_dict(orient="records"), rows, TABLES[table][1])
+            c.execute(f"DELETE FROM {table}{where}", params)
+            self._insert(c, table, rows)
+            self._bump(c, table, None if user is None else [user] + [user_of(r) for r in rows])
+
+    def reset(self, table):
+        # rows are read in the DELETE's transaction, so nothing inserted in
+        # between goes unbacked-up; serializing and compressing them is the worker's
+        c = self.conn()
+        with c:
+            c.execute("BEGIN IMMEDIATE")
+            rows = [clean_record(r) for r in self._select(table).to_dict(orient="records")]
+            c.execute(f"DELETE FROM {table}")
+            self._bump(c, table)
+        backups.schedule_rows(self.json_root, table, backups.new_stamp(), "all", rows)
+
+
+def from_env():
+    kind = os.environ.get("TRACKER_BACKEND", "json").lower()
+    root = os.environ.get("TRACKER_DATA_DIR", ".")
+    if kind == "sqlite":
+        return SqliteBackend(os.environ.get("TRACKER_DB", os.path.join(root, "tracker.db")), json_root=root)
+    return JsonBackend(root)
@@ -0,0 +1,96 @@
+# ===============================
+# Rotated, compressed backups of reset tables
+# ===============================
+# A reset used to shutil.copy every shard next to itself (<file>_backup.json,
+# overwriting the previous backup) inside the rerun. Now it only moves the
+# data out of the way and the background worker (tracker/jobs.py) writes
+#
+#   <data dir>/backups/<table>/<YYYYmmdd-HHMMSS-ffffff>/<shard>.json.gz
+#
+# as {"seq": N, "rows": [...]}, keeping the newest KEEP resets per table
+# (TRACKER_BACKUP_KEEP, default 5).
+#   - JSON backend: the shard's snapshot and journal are renamed to
+#     <file>.<stamp>.resetting(.log) under its lock, O(1); the job replays
+#     them, so even an uncompacted journal never costs the rerun anything.
+#     Staged files left behind by a crash are picked up by sweep().
+#   - SQLite: the rows are read before the DELETE; the job serializes them.
+import gzip, json, os, shutil
+from datetime import datetime
+
+from tracker import jobs, journal
+
+KEEP = int(os.environ.get("TRACKER_BACKUP_KEEP", "5"))
+BACKUP_DIR = "backups"
+STAGED_SUFFIX = ".resetting"
+
+
+def new_stamp():
+    return datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+
+
+def stage(path, stamp):
+    """Move a snapshot and its journal aside (caller holds the file lock) → staged path, or None."""
+    staged = f"{path}.{stamp}{STAGED_SUFFIX}"
+    moved = False
+    for src, dst in ((path, staged), (journal.journal_path(path), journal.journal_path(staged))):
+        if os.path.exists(src):
+            os.replace(src, dst)
+            moved = True
+    return staged if moved else None
+
+
+def _target(root, table, stamp, shard):
+    folder = os.path.join(root, BACKUP_DIR, table, stamp)
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, f"{shard}.json.gz")
+
+
+def _write(target, seq, rows):
+    tmp = target + ".tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+        json.dump({"seq": seq, "rows": rows}, f, ensure_ascii=False)
+    os.replace(tmp, target)
+
+
+def _prune(root, table):
+    folder = os.path.join(root, BACKUP_DIR, table)
+    stamps = sorted(e.name for e in os.scandir(folder) if e.is_dir())
+    for old in stamps[:-KEEP] if KEEP > 0 else []:
+        shutil.rmtree(os.path.join(folder, old), ignore_errors=True)
+
+
+def _compress_staged(root, table, stamp, shard, staged):
+    seq, rows = journal.read_snapshot(staged)
+    rows, seq = journal.replay(rows, seq, journal.read_journal(staged))
+    _write(_target(root, table, stamp, shard), seq, rows)
+    for p in (staged, journal.journal_path(staged)):
+        if os.path.exists(p):
+            os.remove(p)
+    _prune(root, table)
+
+
+def _compress_rows(root, table, stamp, shard, rows):
+    _write(_target(root, table, stamp, shard), 0, rows)
+    _prune(root, table)
+
+
+def schedule_staged(root, table, stamp, shard, staged):
+    return jobs.submit(("backup", staged), _compress_staged, root, table, stamp, shard, staged)
+
+
+def schedule_rows(root, table, stamp, shard, rows):
+    return jobs.submit(("backup", root, table, stamp, shard), _compress_rows, root, table, stamp, shard, rows)
+
+
+def sweep(root, shards, tables):
+    """Queue staged files a crash left behind; shards maps dir name → folder, tables file name → table."""
+    for shard, folder in shards.items():
+        staged = set()
+        for e in os.scandir(folder):
+            name = e.name[:-len(journal.JOURNAL_SUFFIX)] if e.name.endswith(journal.JOURNAL_SUFFIX) else e.name
+            if name.endswith(STAGED_SUFFIX):
+                staged.add(name)
+        for name in sorted(staged):
+            fname, stamp = name[:-len(STAGED_SUFFIX)].rsplit(".", 1)
+            if fname in tables:
+                schedule_staged(root, tables[fname], stamp, shard, os.path.join(folder, name))
@@ -0,0 +1,282 @@
+# ===============================
+# Bulk CSV / Excel import and export
+# ===============================
+# import_file() streams a CSV (pd.read_csv chunks) or .xlsx sheet (openpyxl
+# read-only rows) CHUNK_ROWS rows at a time. Each chunk is checked against the
+# table schema, vectorized:
+#   - columns outside the schema are ignored (and listed in the report),
+#     missing ones are filled like the forms do (defaults, today's date for
+#     "Terakhir Diperbarui", "Belum" for an empty status)
+#   - required cells non-empty, dates parseable (stored as YYYY-MM-DD),
+#     statuses one of STATUS_VALUES, IELTS scores numbers in 0-9 (an empty
+#     Overall is the rounded mean of the four skills, as in the form)
+# Bad rows are reported by line number and skipped. Rows are keyed by KEYS:
+# a later row in the file replaces an earlier one with the same key, and
+# keys already in the table are skipped, so re-importing a file is a no-op.
+# What's left goes to the datastore as one insert — one journal append per
+# user shard (one transaction on SQLite).
+#
+# export_csv() / export_xlsx() stream the table back out chunk by chunk in
+# the same layout, so an export imports cleanly. Excel needs openpyxl.
+#
+# progress(fraction, rows) is called after every chunk in both directions.
+import io, os, time
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+try:
+    import openpyxl
+except ImportError:  # optional; without it only CSV is offered
+    openpyxl = None
+
+from tracker import datastore, metrics
+from tracker.schema import DATE_COLUMNS, IELTS_SKILLS, STATUS_COLUMNS, STATUS_VALUES, TABLES, clean_value, parse_dates
+
+CHUNK_ROWS = 10_000
+MAX_ERRORS = 100  # errors kept in the report (all are counted)
+
+KEYS = {
+    "scholar": ["Nama User", "Beasiswa"],
+    # progress rows are a dated history (tracker/progress_view.py), so the
+    # update date is part of the key
+    "progress": ["Nama User", "Beasiswa", "Terakhir Diperbarui"],
+    "ielts": ["Nama User", "Tanggal Tes"],
+}
+REQUIRED = {"scholar": ["Nama User", "Beasiswa"], "progress": ["Nama User", "Beasiswa"], "ielts": ["Nama User", "Tanggal Tes"]}
+MIME = {"csv": "text/csv", "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"}
+
+
+class BulkFileError(ValueError):
+    pass  # unusable file (format, missing openpyxl); shown to the user as is
+
+
+def formats():
+    return ["csv"] + (["xlsx"] if openpyxl is not None else [])
+
+
+def kind_of(name):
+    ext = os.path.splitext(str(name))[1].lower().lstrip(".")
+    if ext == "csv":
+        return "csv"
+    if ext in ("xlsx", "xlsm"):
+        if openpyxl is None:
+            raise BulkFileError("File Excel butuh paket openpyxl (pip install openpyxl).")
+        return "xlsx"
+    raise BulkFileError(f"Format file tidak didukung: .{ext or '?'} (pakai .csv atau .xlsx).")
+
+
+# -------------------------------
+# read side (chunks of text cells, plus the fraction of the file read)
+# -------------------------------
+def _opened(source):
+    # path, or an uploaded / open binary file
+    return open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+
+
+def _size(f):
+    pos = f.tell()
+    size = f.seek(0, os.SEEK_END)
+    f.seek(pos)
+    return size or None
+
+
+def _csv_chunks(f):
+    size = _size(f)
+    head = f.readline()
+    f.seek(0)
+    sep = ";" if head.count(b";") > head.count(b",") else ","  # spreadsheet exports in id/eu locales
+    reader = pd.read_csv(f, sep=sep, dtype=str, keep_default_na=False, encoding="utf-8-sig",
+                         chunksize=CHUNK_ROWS, skipinitialspace=True)
+    for chunk in reader:
+        yield chunk, (min(f.tell() / size, 1.0) if size else None)
+
+
+def _xlsx_cell(v):
+    if v is None:
+        return ""
+    if isinstance(v, (datetime, date)):
+        return clean_value(pd.Timestamp(v))
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return str(v)
+
+
+def _xlsx_chunks(f):
+    wb = openpyxl.load_workbook(f, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header = [_xlsx_cell(v).strip() for v in next(rows, ())]
+        total = max((ws.max_row or 0) - 1, 0)
+        buf, seen = [], 0
+        for row in rows:
+            buf.append([_xlsx_cell(v) for v in row[:len(header)]])
+            if len(buf) == CHUNK_ROWS:
+                seen += len(buf)
+                yield pd.DataFrame(buf, columns=header, dtype=str), (min(seen / total, 1.0) if total else None)
+                buf = []
+        if buf or not seen:
+            seen += len(buf)
+            yield pd.DataFrame(buf, columns=header, dtype=str), 1.0
+    finally:
+        wb.close()
+
+
+def _validate(table, chunk, first_line, defaults):
+    """Schema-conform a chunk of text cells → (clean frame, [(line, message)])."""
+    _, columns, numeric = TABLES[table]
+    chunk = chunk.rename(columns=lambda c: str(c).strip())
+    chunk = chunk.loc[:, ~chunk.columns.duplicated()]
+    df = pd.DataFrame(index=chunk.index)
+    for c in columns:
+        s = chunk[c].fillna("").astype(str).str.strip() if c in chunk.columns else pd.Series("", index=chunk.index)
+        if defaults and c in defaults:
+            s = s.mask(s.eq(""), str(defaults[c]))
+        df[c] = s
+    bad = pd.Series("", index=df.index)
+
+    def flag(mask, message):
+        nonlocal bad
+        bad = bad.mask(mask & bad.eq(""), message)
+
+    if table == "progress":
+        df["Terakhir Diperbarui"] = df["Terakhir Diperbarui"].mask(df["Terakhir Diperbarui"].eq(""), str(date.today()))
+        for c in STATUS_COLUMNS:
+            canon = df[c].str.lower().map({v.lower(): v for v in STATUS_VALUES})
+            flag(df[c].ne("") & canon.isna(), f"{c} harus salah satu dari {', '.join(STATUS_VALUES)}")
+            df[c] = canon.fillna("Belum")
+    for c in REQUIRED[table]:
+        flag(df[c].eq(""), f"{c} wajib diisi")
+    for c in DATE_COLUMNS[table]:
+        filled = df[c].ne("")
+        parsed, failed = pd.Series(pd.NaT, index=df.index), np.zeros(len(df), dtype=bool)
+        if filled.any():
+            parsed, failed = parse_dates(df[c].where(filled))
+        flag(pd.Series(failed, index=df.index), f"{c} bukan tanggal")
+        df[c] = parsed.dt.strftime("%Y-%m-%d").where(filled & ~failed, df[c])
+    for c in numeric:
+        values = pd.to_numeric(df[c].str.replace(",", ".", regex=False).mask(df[c].eq("")), errors="coerce").astype(float)
+        flag(df[c].ne("") & values.isna(), f"{c} bukan angka")
+        flag(values.notna() & ~values.between(0, 9), f"{c} di luar 0-9")
+        df[c] = values
+    if table == "ielts":
+        df["Overall"] = df["Overall"].fillna(df[IELTS_SKILLS].mean(axis=1, skipna=False).round(1))
+    lines = np.arange(first_line, first_line + len(df))
+    errors = [(int(lines[i]), m) for i, m in enumerate(bad.to_numpy()) if m]
+    ignored = [c for c in chunk.columns if c not in columns]
+    return df[bad.eq("").to_numpy()], errors, ignored
+
+
+def _key_of(table, df):
+    cols = KEYS[table]
+    parts = []
+    for c in cols:
+        s = df[c]
+        if pd.api.types.is_datetime64_any_dtype(s):
+            s = s.dt.strftime("%Y-%m-%d")
+        parts.append(s.astype(object).where(s.notna(), "").astype(str).to_numpy())
+    return list(zip(*parts))
+
+
+def import_file(table, source, name=None, defaults=None, progress=None, dry_run=False):
+    """Validate, de-duplicate and insert the rows of a CSV / xlsx file → report dict."""
+    t0 = time.perf_counter()
+    kind = kind_of(name or getattr(source, "name", source))
+    f = _opened(source)
+    report = {"table": table, "rows": 0, "imported": 0, "invalid": 0, "duplicates": 0, "existing": 0,
+              "errors": [], "ignored_columns": [], "seconds": 0.0}
+    pending = {}  # key -> record; a later line replaces an earlier one
+    try:
+        chunks = _csv_chunks(f) if kind == "csv" else _xlsx_chunks(f)
+        line = 2  # line 1 is the header
+        for chunk, fraction in chunks:
+            with metrics.timer("import_parse", table=table):
+                df, errors, ignored = _validate(table, chunk, line, defaults)
+            line += len(chunk)
+            report["rows"] += len(chunk)
+            report["invalid"] += len(errors)
+            report["errors"] += errors[:MAX_ERRORS - len(report["errors"])]
+            report["ignored_columns"] += [c for c in ignored if c not in report["ignored_columns"]]
+            before = len(pending)
+            pending.update(zip(_key_of(table, df), df.astype(object).to_dict(orient="records")))
+            report["duplicates"] += len(df) - (len(pending) - before)
+            if progress:
+                progress(fraction, report["rows"])
+    finally:
+        if f is not source:
+            f.close()
+    existing = set(_key_of(table, datastore.load(table))) if pending else set()
+    rows = [r for k, r in pending.items() if k not in existing]
+    report["existing"] = len(pending) - len(rows)
+    if rows and not dry_run:
+        datastore.insert(table, rows)
+    report["imported"] = len(rows)
+    report["seconds"] = round(time.perf_counter() - t0, 3)
+    metrics.count("rows", report["rows"], step="import", table=table)
+    return report
+
+
+# -------------------------------
+# write side
+# -------------------------------
+def _export_frame(table, chunk):
+    # the stored layout: schema columns, dates as YYYY-MM-DD, missing as ""
+    out = chunk[TABLES[table][1]].copy()
+    for c in out.columns:
+        if pd.api.types.is_datetime64_any_dtype(out[c]):
+            out[c] = out[c].dt.strftime("%Y-%m-%d")
+        elif isinstance(out[c].dtype, pd.CategoricalDtype):
+            out[c] = out[c].astype(object)
+    return out
+
+
+def _export_chunks(table, user, progress):
+    df = datastore.load(table, user)
+    n = len(df)
+    for start in range(0, max(n, 1), CHUNK_ROWS):
+        chunk = _export_frame(table, df.iloc[start:start + CHUNK_ROWS])
+        yield chunk
+        if progress:
+            progress(min((start + len(chunk)) / n, 1.0) if n else 1.0, start + len(chunk))
+    metrics.count("rows", n, step="export", table=table)
+
+
+def iter_csv(table, user=None, progress=None):
+    """The table as CSV text, one piece per chunk (the first one has a BOM and the header)."""
+    first = True
+    for chunk in _export_chunks(table, user, progress):
+        yield ("\ufeff" if first else "") + chunk.to_csv(index=False, header=first, na_rep="")
+        first = False
+
+
+def export_csv(table, dest, user=None, progress=None):
+    f = open(dest, "w", encoding="utf-8", newline="") if isinstance(dest, (str, os.PathLike)) else dest
+    try:
+        for piece in iter_csv(table, user, progress):
+            f.write(piece)
+    finally:
+        if f is not dest:
+            f.close()
+
+
+def export_xlsx(table, dest, user=None, progress=None):
+    if openpyxl is None:
+        raise BulkFileError("Export Excel butuh paket openpyxl (pip install openpyxl).")
+    wb = openpyxl.Workbook(write_only=True)  # rows go straight to the zip stream
+    ws = wb.create_sheet(table)
+    ws.append(TABLES[table][1])
+    for chunk in _export_chunks(table, user, progress):
+        for row in chunk.itertuples(index=False, name=None):
+            ws.append(["" if v is None or (isinstance(v, float) and np.isnan(v)) else v for v in row])
+    wb.save(dest)
+
+
+def export_bytes(table, kind, user=None):
+    """Whole export in memory, for st.download_button."""
+    if kind == "csv":
+        return "".join(iter_csv(table, user)).encode("utf-8")
+    buf = io.BytesIO()
+    export_xlsx(table, buf, user)
+    return buf.getvalue()
@@ -0,0 +1,143 @@
+# ===============================
+# Columnar (Arrow IPC) snapshots next to the JSON ones
+# ===============================
+# With TRACKER_SNAPSHOT=arrow (needs pyarrow), every snapshot the journal
+# writes also gets a typed copy beside it:
+#
+#   data_progress.json         snapshot — still the source of truth
+#   data_progress.json.arrow   same rows as an uncompressed Arrow IPC file,
+#                              stamped with the snapshot's seq
+#
+# Loading memory-maps the .arrow file instead of json.loads-ing the list of
+# dicts, and the frame comes out typed: datetime64 dates, categorical users /
+# scholarships / countries / statuses, float band scores (schema.DATE_COLUMNS,
+# CATEGORY_COLUMNS). The copy is only used while its seq equals the JSON
+# snapshot's; every snapshot write replaces or removes it, so a process
+# running without the option can never leave a stale one behind.
+import os, threading
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional; without it snapshots stay JSON-only
+    pa = None
+
+from tracker import metrics
+from tracker.schema import CATEGORY_COLUMNS, DATE_COLUMNS, TABLES, conform, empty_df, parse_dates, to_frame
+
+ARROW_SUFFIX = ".arrow"
+SEQ_KEY = b"tracker.seq"
+
+
+def enabled():
+    return pa is not None and os.environ.get("TRACKER_SNAPSHOT", "json").lower() == "arrow"
+
+
+def arrow_path(path):
+    return path + ARROW_SUFFIX
+
+
+def table_of(path):
+    # shards keep the table's default file name
+    name = os.path.basename(path)
+    return next((t for t, (fname, _, _) in TABLES.items() if fname == name), None)
+
+
+def typed(table, df):
+    """Cast the date and low-cardinality text columns; other columns are left as they are.
+
+    A date column stays text if any non-empty cell doesn't parse, so writing
+    the frame back never loses what the user typed.
+    """
+    df = conform(table, df)
+    for c in DATE_COLUMNS[table]:
+        if pd.api.types.is_datetime64_any_dtype(df[c]):
+            continue
+        s = df[c].where(df[c].astype(str).str.strip().ne(""))
+        parsed, failed = parse_dates(s)
+        if not failed.any():
+            df[c] = parsed
+    for c in CATEGORY_COLUMNS[table]:
+        if not isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype("category")
+    return df
+
+
+def empty(table):
+    return typed(table, empty_df(table))
+
+
+def records_frame(table, rows):
+    return typed(table, to_frame(table, rows)) if rows else empty(table)
+
+
+def concat(table, frames):
+    """pd.concat that keeps category columns categorical when their categories differ."""
+    if not frames:
+        return empty(table)
+    df = pd.concat(frames, ignore_index=True)
+    for c in CATEGORY_COLUMNS[table]:
+        parts = [f[c] for f in frames if len(f)]  # empty shards' categories may have another dtype
+        categorical = [isinstance(p.dtype, pd.CategoricalDtype) for p in parts]
+        if parts and all(categorical) and not isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = union_categoricals(parts, ignore_order=True)
+    return df
+
+
+def read(path, seq):
+    """The frame in <path>.arrow if it was written for snapshot `seq`, else None."""
+    apath = arrow_path(path)
+    if pa is None or not os.path.exists(apath):
+        return None
+    try:
+        with pa.memory_map(apath, "r") as source:
+            reader = pa.ipc.open_file(source)
+            meta = reader.schema.metadata or {}
+            if int(meta.get(SEQ_KEY, b"-1")) != seq:
+                return None
+            metrics.count("bytes_read", source.size(), table=table_of(path))
+            return reader.read_all().to_pandas()
+    except (pa.ArrowException, OSError, ValueError):
+        return None  # unreadable copy: fall back to the JSON snapshot
+
+
+def write(path, rows, seq):
+    """Write (or, when disabled / not representable, remove) the copy for a snapshot."""
+    publish(path, stage(path, rows, seq))
+
+
+def stage(path, rows, seq):
+    """The copy for a snapshot in a temp file → its path; None when there should be no copy."""
+    table = table_of(path)
+    if not enabled() or table is None:
+        return None
+    try:
+        data = pa.Table.from_pandas(records_frame(table, rows), preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None  # e.g. a column mixing numbers and text; JSON alone still has it
+    data = data.replace_schema_metadata({**(data.schema.metadata or {}), SEQ_KEY: str(seq).encode()})
+    tmp = f"{arrow_path(path)}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with pa.OSFile(tmp, "wb") as sink:
+        with pa.ipc.new_file(sink, data.schema) as writer:
+            writer.write_table(data)
+    with open(tmp, "rb") as f:
+        os.fsync(f.fileno())
+        metrics.count("bytes_written", os.fstat(f.fileno()).st_size, table=table)
+    return tmp
+
+
+def publish(path, tmp):
+    """Put a staged copy in place (None: remove the current one)."""
+    if tmp is None:
+        remove(path)
+    else:
+        os.replace(tmp, arrow_path(path))
+
+
+def remove(path):
+    try:
+        os.remove(arrow_path(path))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,124 @@
+# ===============================
+# Cross-process write serialization + merge of stale saves
+# ===============================
+# Every Streamlit session (a thread) and every server worker (a process) writes
+# the same files. locked(path) serializes them with an OS file lock on
+# <path>.lock (flock on POSIX, msvcrt elsewhere). It's re-entrant within a
+# thread, so helpers that lock can call each other.
+#
+# merge_rows() is the three-way merge used when a whole-table save was based on
+# an older version than what's on disk: the rows the editor removed/added
+# relative to its base are applied to the current rows, so changes written
+# in between by other sessions are kept instead of clobbered.
+import os, threading, time
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from tracker.schema import clean_value
+
+LOCK_SUFFIX = ".lock"
+LOCK_TIMEOUT = 30
+
+_held = threading.local()
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+class LockTimeout(Exception):
+    pass
+
+
+def _try_lock(fd, shared):
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def locked(path, shared=False, timeout=LOCK_TIMEOUT):
+    held = getattr(_held, "paths", None)
+    if held is None:
+        held = _held.paths = {}
+    if path in held:
+        # already ours in this thread (shared inside exclusive is fine; the
+        # reverse isn't used anywhere)
+        held[path] += 1
+        try:
+            yield
+        finally:
+            held[path] -= 1
+        return
+    with _thread_locks_guard:
+        tlock = _thread_locks.setdefault(path, threading.Lock())
+    # threads of this process queue on a plain lock, processes on the file lock
+    if not tlock.acquire(timeout=timeout):
+        raise LockTimeout(path)
+    try:
+        fd = os.open(path + LOCK_SUFFIX, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            deadline = time.monotonic() + timeout
+            delay = 0.001
+            while not _try_lock(fd, shared):
+                if time.monotonic() > deadline:
+                    raise LockTimeout(path)
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+            held[path] = 1
+            try:
+                yield
+            finally:
+                del held[path]
+                _unlock(fd)
+        finally:
+            os.close(fd)
+    finally:
+        tlock.release()
+
+
+def _row_key(row, columns):
+    out = []
+    for c in columns:
+        v = clean_value(row.get(c, ""))
+        if isinstance(v, (int, float)) and not isinstance(v, bool):
+            v = float(v)  # 7 and 7.0 are the same band score
+        out.append(v)
+    return tuple(out)
+
+
+def merge_rows(current, base, edited, columns):
+    """Apply the base → edited difference (as a multiset of rows) to current."""
+    base_n = Counter(_row_key(r, columns) for r in base)
+    edited_n = Counter(_row_key(r, columns) for r in edited)
+    removed, added = base_n - edited_n, edited_n - base_n
+    out = []
+    for r in current:
+        k = _row_key(r, columns)
+        if removed[k] > 0:
+            removed[k] -= 1
+            continue
+        out.append(r)
+    for r in edited:
+        k = _row_key(r, columns)
+        if added[k] > 0:
+            added[k] -= 1
+            out.append(r)
+    return out
@@ -0,0 +1,349 @@
+# ===============================
+# Cached data access shared by all pages
+# ===============================
+# Streamlit reruns the whole script on every widget interaction. Modules stay
+# imported for the life of the server process, so the cache below is shared by
+# every rerun and every session: a table is only re-read and re-parsed when the
+# backend's stamp changes (file mtime/size for JSON, a version counter for
+# SQLite) or after a write from this process. Entries are evicted LRU once the
+# total DataFrame memory passes the budget (TRACKER_CACHE_MB, default 256).
+#
+# Everything is keyed on (table, user): user=None is the all-users view, any
+# other value only that user's partition. On a partitioned backend the
+# all-users frame is stitched from the cached per-user frames, so a write by
+# one user only re-parses that user's shard.
+#
+# Frames returned by load() are shallow copies of the cached one — add columns
+# or build new frames freely, but don't edit cells in place.
+#
+# derived() keeps objects computed from a table (e.g. the latest-progress view)
+# next to it. Writes from this process hand the change to each derived object
+# (its insert(rows) / delete(match)) instead of dropping it, so maintained views
+# never have to be rebuilt from the full table after a form submit.
+#
+# A view a write can't be folded into is rebuilt on the background worker
+# (tracker/jobs.py) right away. derived_latest() is the page-side read: once
+# a view has been built, it hands back the last result with its freshness
+# instead of rebuilding inside the rerun.
+#
+# With TRACKER_METRICS on, loads, view builds and saves are timed and their
+# cache hits / misses and rows counted (tracker/metrics.py).
+import os, threading, time
+from collections import OrderedDict
+
+import pandas as pd
+
+from tracker import backends, columnar, jobs, metrics
+from tracker.backends import CorruptFileError  # noqa: F401  (re-exported for pages)
+from tracker.schema import clean_record, clean_value, empty_df, user_of
+
+CACHE_BUDGET_BYTES = int(os.environ.get("TRACKER_CACHE_MB", "256")) * 2**20
+BULK_ROWS = 5000  # bigger inserts drop the derived views; their vectorized rebuild is cheaper
+
+_lock = threading.RLock()
+_cache = OrderedDict()  # (table, user) -> (stamp, df, nbytes)
+_derived = {}  # (table, name, user) -> (stamp, obj)
+_last = {}  # (table, name, user) -> (stamp, obj, built at, build, combine); kept through writes
+_backend = None
+stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def get_backend():
+    global _backend
+    with _lock:
+        if _backend is None:
+            _backend = backends.from_env()
+        return _backend
+
+
+def set_backend(backend):
+    global _backend
+    with _lock:
+        _backend = backend
+        _cache.clear()
+        _derived.clear()
+        _last.clear()
+
+
+def users():
+    return get_backend().users()
+
+
+def stamp(table, user=None):
+    """Hashable data version of a table (partition); changes on every write."""
+    return get_backend().stamp(table, user)
+
+
+def _evict():
+    total = sum(e[2] for e in _cache.values())
+    while _cache and total > CACHE_BUDGET_BYTES:
+        _, (_, _, nbytes) = _cache.popitem(last=False)
+        total -= nbytes
+        stats["evictions"] += 1
+        metrics.count("cache_evictions", cache="frames")
+
+
+def _load_all_partitions(table, backend):
+    # stream over the shards through the per-user cache
+    names = backend.users()
+    frames = [load(table, u) for u in names]
+    if columnar.enabled():
+        df = columnar.concat(table, frames)  # keeps the per-shard categories categorical
+    else:
+        filled = [f for f in frames if len(f)]  # see JsonBackend.load
+        df = pd.concat(filled, ignore_index=True) if filled else empty_df(table)
+    df.attrs.update(version={u: f.attrs.get("version") for u, f in zip(names, frames)}, user=None)
+    return df
+
+
+def load(table, user=None):
+    with metrics.timer("load", table=table):
+        return _load(table, user)
+
+
+def _load(table, user):
+    backend = get_backend()
+    stamp = backend.stamp(table, user)
+    key = (table, user)
+    with _lock:
+        entry = _cache.get(key)
+        if entry and entry[0] == stamp:
+            _cache.move_to_end(key)
+            stats["hits"] += 1
+            metrics.count("cache_hits", cache="frames", table=table)
+            return entry[1].copy(deep=False)
+        stats["misses"] += 1
+    metrics.count("cache_misses", cache="frames", table=table)
+    if user is None and backend.partitioned:
+        df = _load_all_partitions(table, backend)
+    else:
+        df = backend.load(table, user)
+        metrics.count("rows", len(df), step="load", table=table)
+    with _lock:
+        _cache[key] = (stamp, df, int(df.memory_usage(deep=True).sum()))
+        _evict()
+    return df.copy(deep=False)
+
+
+def find(table, match, user=None):
+    """Rows equal to every {column: value} in match (indexed on SQLite)."""
+    if user is not None:
+        match = dict(match, **{"Nama User": user})
+    backend = get_backend()
+    if backend.indexed:
+        return backend.find(table, match)
+    df = load(table, user)
+    mask = pd.Series(True, index=df.index)
+    for k, v in match.items():
+        mask &= df[k] == v
+    return df[mask]
+
+
+def derived(table, name, build, user=None, combine=None):
+    """build(df) once per table version; kept current by writes from this process.
+
+    On a partitioned backend, passing combine(list of objs) builds the
+    all-users object from the per-user ones instead of from the full table.
+    """
+    backend = get_backend()
+    stamp = backend.stamp(table, user)
+    key = (table, name, user)
+    with _lock:
+        entry = _derived.get(key)
+        if entry and entry[0] == stamp:
+            metrics.count("cache_hits", cache="views", view=name)
+            return entry[1]
+    metrics.count("cache_misses", cache="views", view=name)
+    if user is None and combine is not None and backend.partitioned:
+        obj = combine([derived(table, name, build, u) for u in backend.users()])
+    else:
+        df = load(table, user)
+        with metrics.timer("build", view=name):
+            obj = build(df)
+        metrics.count("rows", len(df), step="build", view=name)
+    with _lock:
+        _derived[key] = (stamp, obj)
+        _last[key] = (stamp, obj, time.time(), build, combine)
+    return obj
+
+
+def _refresh(key):
+    # a view a write dropped: still current (another user's partition changed)
+    # → keep it, else rebuild it off the rerun
+    entry = _last.get(key)
+    if entry is None:
+        return
+    table, name, user = key
+    if get_backend().stamp(table, user) == entry[0]:
+        with _lock:
+            _derived.setdefault(key, entry[:2])
+        return
+    jobs.submit(("view",) + key, derived, table, name, entry[3], user, entry[4])
+
+
+def derived_latest(table, name, build, user=None, combine=None):
+    """derived() for pages → (obj, info). The first build runs inline; after
+    that a stale view is rebuilt in the background and the last result is
+    returned meanwhile. info: fresh, stamp (the version obj was built on —
+    key figures on it), age (seconds since built), building."""
+    stamp = get_backend().stamp(table, user)
+    key = (table, name, user)
+    with _lock:
+        entry, last = _derived.get(key), _last.get(key)
+    if last is not None and last[0] == stamp:
+        return last[1], {"fresh": True, "stamp": stamp, "age": time.time() - last[2], "building": False}
+    if last is None or (entry and entry[0] == stamp):
+        obj = derived(table, name, build, user, combine)
+        with _lock:
+            last = _last.get(key)
+        return obj, {"fresh": True, "stamp": stamp, "age": time.time() - last[2] if last else 0.0, "building": False}
+    _refresh(key)
+    return last[1], {"fresh": False, "stamp": last[0], "age": time.time() - last[2], "building": True}
+
+
+def invalidate(table=None):
+    with _lock:
+        if table is None:
+            _cache.clear()
+            _derived.clear()
+        else:
+            for key in [k for k in _cache if k[0] == table]:
+                del _cache[key]
+            for key in [k for k in _derived if k[0] == table]:
+                del _derived[key]
+        stale = [k for k in _last if table is None or k[0] == table]
+    for key in stale:
+        _refresh(key)
+
+
+def _scoped(method, args, user):
+    # the part of a write that concerns one user's partition (None = nothing)
+    if user is None:
+        return args
+    if method == "insert":
+        rows = [r for r in args[0] if user_of(r) == user]
+        return (rows,) if rows else None
+    if method == "delete" and "Nama User" in args[0] and user_of(args[0]) != user:
+        return None
+    return args
+
+
+# -------------------------------
+# writes (drop cached frames, update derived views in place)
+# -------------------------------
+def _write(table, method, *args):
+    with metrics.timer("save", table=table, op=method):
+        out = _apply_write(table, method, *args)
+    if method == "insert":
+        metrics.count("rows", len(args[0]), step="save", table=table)
+    return out
+
+
+def _fold_method(obj, method):
+    # a view's own insert(rows) / update(match, values) / delete(match), or
+    # None (rebuild it). A frame-valued view (the Gantt events) only has
+    # pandas' unrelated DataFrame.insert / update, so it's always rebuilt.
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return None
+    return getattr(obj, method, None)
+
+
+def _apply_write(table, method, *args):
+    backend = get_backend()
+    with _lock:
+        keys = [k for k in _derived if k[0] == table]
+    before = {k: backend.stamp(table, k[2]) for k in keys}
+    out = getattr(backend, method)(table, *args)
+    touched = {user_of(r) for r in args[0]} if method == "insert" else None
+    fold = not (method == "insert" and len(args[0]) > BULK_ROWS)
+    dropped = []
+    with _lock:
+        for key in [k for k in _cache if k[0] == table]:
+            if touched is None or key[1] is None or key[1] in touched:
+                del _cache[key]
+        # views built on the version we just wrote on top of absorb the change;
+        # anything else (stale, or no incremental method) is dropped and rebuilt
+        for key in keys:
+            entry = _derived.get(key)
+            if entry is None:
+                continue
+            stamp, obj = entry
+            scoped = _scoped(method, args, key[2])
+            fn = _fold_method(obj, method)
+            if fold and stamp == before[key] and (scoped is None or (fn is not None and fn(*scoped) is not False)):
+                _derived[key] = (backend.stamp(table, key[2]), obj)
+                if key in _last:
+                    _last[key] = (_derived[key][0], obj, time.time()) + _last[key][3:]
+            else:
+                del _derived[key]
+                dropped.append(key)
+    for key in dropped:
+        _refresh(key)
+    return out
+
+
+def _cells(s):
+    # a column as stored cells ("" for missing, dates as ISO strings), for matching
+    if pd.api.types.is_string_dtype(s) and not isinstance(s.dtype, pd.CategoricalDtype):
+        return s.astype(object).where(s.notna(), "").to_numpy()
+    return s.map(clean_value).to_numpy(dtype=object)
+
+
+def matching(table, match):
+    """Rows of the cached frame a {column: value} write filter hits (blank "" hits missing cells too)."""
+    match = clean_record(match)
+    df = load(table, user_of(match) if "Nama User" in match else None)
+    for k in sorted(match, key=lambda k: k not in ("Nama User", "Beasiswa")):  # selective keys first
+        if df.empty:
+            break
+        df = df[_cells(df[k]) == match[k]]
+    return df
+
+
+def insert(table, rows):
+    _write(table, "insert", rows)
+
+
+def _matched_write(table, method, match, *rest):
+    # count on the cached frame; on a partitioned backend a match without a
+    # user goes only to the shards holding a hit (the backend would re-read
+    # every shard to find them)
+    hits = matching(table, match)
+    if hits.empty:
+        return 0
+    if "Nama User" in match or not get_backend().partitioned:
+        out = _write(table, method, match, *rest)
+        return len(hits) if out is None else out
+    users = pd.Series(_cells(hits["Nama User"])).value_counts()
+    n = 0
+    for user, count in users.items():
+        out = _write(table, method, dict(match, **{"Nama User": user}), *rest)
+        n += count if out is None else out
+    return n
+
+
+def update(table, match, values):
+    """→ number of rows changed (0: nothing matched, nothing written)."""
+    return _matched_write(table, "update", match, values)
+
+
+def delete(table, match):
+    """→ number of rows deleted (0: nothing matched, nothing written)."""
+    return _matched_write(table, "delete", match)
+
+
+def replace(table, df, base=None):
+    """Whole-table save. Pass the frame the edit started from as `base` so a
+    save from a stale read is merged instead of overwriting newer rows (and,
+    for a single user's frame, only that user's rows are rewritten)."""
+    with metrics.timer("save", table=table, op="replace"):
+        get_backend().replace(table, df.to_dict(orient="records"), base)
+    metrics.count("rows", len(df), step="save", table=table)
+    invalidate(table)
+
+
+def reset(table):
+    """Keep a backup copy, then empty the table."""
+    with metrics.timer("save", table=table, op="reset"):
+        get_backend().reset(table)
+    invalidate(table)
@@ -0,0 +1,225 @@
+# ===============================
+# Deadline index over the scholarship phase windows — maintained view
+# ===============================
+# Every complete phase of every scholarship (the same windows the Gantt chart
+# draws, gantt.phase_windows) kept in sorted lists, overall and per user:
+#
+#   by_end     (Selesai, Mulai, window)  → upcoming(): deadlines in [D, D + N days]
+#   by_start   (Mulai, Selesai, window)  → overlapping() / open_on(): windows that
+#                                          intersect [a, b]
+#
+# Sort keys are the dates as int64 nanoseconds (cheap to compare); window is
+# (user, beasiswa, phase, Mulai, Selesai).
+#
+# upcoming() is two bisects plus the k hits: O(log N + k). For overlaps, a
+# max-Selesai tree over by_start prunes every subtree that ends before `a`, so
+# only paths to hits are walked: O(log N + k log N). The tree is rebuilt
+# (vectorized) on the first overlap query after a change. Inserts and deletes
+# from this process update the lists in place, like the other views.
+import heapq, threading
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+import pandas as pd
+
+from tracker.gantt import WINDOW_COLUMNS, phase_windows
+from tracker.schema import clean_value, to_frame, user_of
+
+_MAX = np.iinfo(np.int64).max
+CONFLICT_COLUMNS = ["Nama User", "Beasiswa A", "Tahap A", "Beasiswa B", "Tahap B", "Mulai", "Selesai"]
+
+
+class _Windows:
+    def __init__(self):
+        self.by_start = []
+        self.by_end = []
+        self._tree = None
+
+    def extend(self, ws):
+        # one sort per list; timsort merges the already-sorted runs
+        self.by_start = sorted(self.by_start + [(w[3].value, w[4].value, w) for w in ws])
+        self.by_end = sorted(self.by_end + [(w[4].value, w[3].value, w) for w in ws])
+        self._tree = None
+
+    def copy(self):
+        out = _Windows()
+        out.by_start, out.by_end = list(self.by_start), list(self.by_end)
+        return out
+
+    def remove(self, w):
+        s, e = w[3].value, w[4].value
+        for lst, item in ((self.by_start, (s, e, w)), (self.by_end, (e, s, w))):
+            i = bisect_left(lst, item)
+            if i < len(lst) and lst[i] == item:
+                del lst[i]
+        self._tree = None
+
+    def ending_between(self, a, b):
+        lo, hi = bisect_left(self.by_end, (a.value,)), bisect_right(self.by_end, (b.value, _MAX))
+        return [t[2] for t in self.by_end[lo:hi]]
+
+    def _max_end_tree(self):
+        if self._tree is None:
+            size = 1 << max(1, (len(self.by_start) - 1).bit_length())
+            tree = np.full(2 * size, np.iinfo(np.int64).min, dtype=np.int64)
+            tree[size:size + len(self.by_start)] = [t[1] for t in self.by_start]
+            level = size
+            while level > 1:
+                tree[level // 2:level] = np.maximum(tree[level:2 * level:2], tree[level + 1:2 * level:2])
+                level //= 2
+            self._tree = (size, tree)
+        return self._tree
+
+    def intersecting(self, a, b):
+        # windows with start <= b and end >= a, in start order
+        hi = bisect_right(self.by_start, (b.value, _MAX))
+        if not hi:
+            return []
+        size, tree = self._max_end_tree()
+        out, stack = [], [(1, 0, size)]
+        while stack:
+            node, lo, span = stack.pop()
+            if lo >= hi or tree[node] < a.value:
+                continue
+            if span == 1:
+                out.append(lo)
+                continue
+            half = span // 2
+            stack.append((2 * node + 1, lo + half, half))
+            stack.append((2 * node, lo, half))
+        return [self.by_start[i][2] for i in out]
+
+
+def _frame(windows):
+    df = pd.DataFrame(windows, columns=WINDOW_COLUMNS)
+    df[["Mulai", "Selesai"]] = df[["Mulai", "Selesai"]].astype("datetime64[ns]")
+    return df
+
+
+def _day(d):
+    return pd.Timestamp(d).normalize() if d is not None else pd.Timestamp.today().normalize()
+
+
+class DeadlineIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.all = _Windows()
+        self.by_user = {}  # "Nama User" -> _Windows
+        self._changes = 0  # bumped on every insert / delete
+        self._conflicts = {}  # user -> (_changes, conflicts frame)
+
+    @classmethod
+    def from_frame(cls, df_scholar):
+        index = cls()
+        index._add(phase_windows(df_scholar))
+        return index
+
+    @classmethod
+    def merge(cls, indexes):
+        """All-users index from per-user ones (their users never overlap)."""
+        out = cls()
+        starts, ends = [], []
+        for ix in indexes:
+            with ix._lock:
+                for user, windows in ix.by_user.items():
+                    out.by_user[user] = windows.copy()
+                starts.append(ix.all.by_start)
+                ends.append(ix.all.by_end)
+        # every input list is sorted already: one k-way merge, not a re-sort per user
+        out.all.by_start = list(heapq.merge(*starts))
+        out.all.by_end = list(heapq.merge(*ends))
+        return out
+
+    def _add(self, events):
+        groups = {}
+        for u, b, phase, start, end in zip(events["Nama User"], events["Beasiswa"], events["Tahap"],
+                                           events["Mulai"], events["Selesai"]):
+            user = user_of({"Nama User": u})
+            groups.setdefault(user, []).append((user, str(clean_value(b)), phase, start, end))  # plain str so ties compare
+        self.all.extend([w for ws in groups.values() for w in ws])
+        for user, ws in groups.items():
+            self.by_user.setdefault(user, _Windows()).extend(ws)
+        self._changes += 1
+
+    def _windows(self, user):
+        return self.all if user is None else self.by_user.get(user, _Windows())
+
+    # -------------------------------
+    # incremental maintenance
+    # -------------------------------
+    def insert(self, rows):
+        events = phase_windows(to_frame("scholar", rows))
+        with self._lock:
+            self._add(events)
+
+    def delete(self, match):
+        """Apply a delete filter; False when it isn't on Beasiswa / Nama User (rebuild instead)."""
+        if not match or set(match) - {"Beasiswa", "Nama User"}:
+            return False
+        with self._lock:
+            users = [user_of(match)] if "Nama User" in match else list(self.by_user)
+            for user in users:
+                windows = self.by_user.get(user)
+                if windows is None:
+                    continue
+                gone = [t[2] for t in windows.by_start
+                        if "Beasiswa" not in match or t[2][1] == str(clean_value(match["Beasiswa"]))]
+                for w in gone:
+                    windows.remove(w)
+                    self.all.remove(w)
+            self._changes += 1
+        return True
+
+    # -------------------------------
+    # queries (frames of WINDOW_COLUMNS)
+    # -------------------------------
+    def upcoming(self, days=30, user=None, today=None):
+        """Phases whose window closes within the next `days` days (today included), soonest first."""
+        start = _day(today)
+        with self._lock:
+            hits = self._windows(user).ending_between(start, start + pd.Timedelta(days=days))
+        df = _frame(hits)
+        df["Sisa Hari"] = (df["Selesai"] - start).dt.days
+        return df
+
+    def overlapping(self, start, end, user=None):
+        """Phases whose window intersects [start, end]."""
+        with self._lock:
+            return _frame(self._windows(user).intersecting(_day(start), _day(end)))
+
+    def open_on(self, day=None, user=None):
+        """Phases open on `day` (default today)."""
+        return self.overlapping(_day(day), _day(day), user)
+
+    def conflicts(self, user=None):
+        """Pairs of one user's phases from different scholarships whose windows overlap.
+
+        Can be quadratic in a user's phases, so the frame is kept until the
+        index next changes (treat it as read-only).
+        """
+        with self._lock:
+            hit = self._conflicts.get(user)
+            if hit is not None and hit[0] == self._changes:
+                return hit[1]
+            changes = self._changes
+            users = list(self.by_user) if user is None else [user]
+            per_user = [list(self.by_user[u].by_start) for u in users if u in self.by_user]
+        pairs = []
+        for windows in per_user:
+            active = []  # sweep in start order, keeping windows not yet closed
+            for start, end, w in windows:
+                active = [a for a in active if a[0] >= start]
+                pairs += [(a[1], w) for a in active if a[1][1] != w[1]]
+                active.append((end, w))
+        a = [p[0] for p in pairs]
+        b = [p[1] for p in pairs]
+        df = pd.DataFrame({
+            "Nama User": [w[0] for w in a], "Beasiswa A": [w[1] for w in a], "Tahap A": [w[2] for w in a],
+            "Beasiswa B": [w[1] for w in b], "Tahap B": [w[2] for w in b],
+            "Mulai": np.maximum([w[3].value for w in a], [w[3].value for w in b]).astype("datetime64[ns]"),
+            "Selesai": np.minimum([w[4].value for w in a], [w[4].value for w in b]).astype("datetime64[ns]"),
+        } if pairs else {}, columns=CONFLICT_COLUMNS)
+        with self._lock:
+            if self._changes == changes:
+                self._conflicts[user] = (changes, df)
+        return df
@@ -0,0 +1,115 @@
+# ===============================
+# st.data_editor deltas → row-level writes
+# ===============================
+# An st.data_editor with a key keeps its pending changes in session_state as
+# {"edited_rows": {pos: {col: value}}, "added_rows": [{col: value}],
+#  "deleted_rows": [pos]}, positions being rows of the frame it was given.
+# row_ops() turns those into datastore insert / update / delete calls, so
+# saving one edited cell appends one journal line instead of rewriting the
+# table. Writes are matched on the row's full original contents (a blank cell
+# matches a missing / NULL one); when a touched row has an identical twin in
+# the frame that match would hit both, so apply_changes() falls back to a
+# whole-table replace for that batch. Added rows are written with every schema
+# column, blanks included, so they can be matched the same way later.
+#
+# An update / delete that changes nothing (the stored row doesn't compare
+# equal to what the editor showed) is retried as a merged replace on the
+# current rows; one whose row is gone altogether is reported as not saved.
+import pandas as pd
+
+from tracker import datastore, journal
+from tracker.schema import DATE_COLUMNS, TABLES, clean_record, clean_value
+
+
+def pending_count(changes):
+    if not changes:
+        return 0
+    return len(changes.get("edited_rows", {})) + len(changes.get("added_rows", [])) + len(changes.get("deleted_rows", []))
+
+
+def _cell(table, col, value):
+    # the editor hands dates back as "YYYY-MM-DDT00:00:00"; store them like the forms do
+    if col in DATE_COLUMNS[table] and isinstance(value, str) and value.strip():
+        try:
+            return clean_value(pd.Timestamp(value))
+        except ValueError:
+            return value
+    return clean_value(value)
+
+
+def _values(table, row):
+    return {c: _cell(table, c, v) for c, v in row.items()}
+
+
+def _deltas(table, changes, defaults):
+    edited = {int(i): _values(table, v) for i, v in changes.get("edited_rows", {}).items() if v}
+    deleted = sorted({int(i) for i in changes.get("deleted_rows", [])})
+    added = []
+    for r in changes.get("added_rows", []):
+        vals = {c: v for c, v in _values(table, r).items() if v != ""}
+        if vals:
+            added.append(dict(dict.fromkeys(TABLES[table][1], ""), **dict(defaults or {}, **vals)))
+    return edited, deleted, added
+
+
+def row_ops(table, base, changes, defaults=None):
+    """Editor deltas on `base` → [(method, args)] for datastore, or None (replace instead)."""
+    edited, deleted, added = _deltas(table, changes, defaults)
+    touched = sorted(set(edited) | set(deleted))
+    if touched and base.duplicated(keep=False).to_numpy()[touched].any():
+        return None
+    original = {i: clean_record(base.iloc[i].to_dict()) for i in touched}
+    ops = [("delete", (original[i],)) for i in deleted]
+    ops += [("update", (original[i], v)) for i, v in edited.items() if i not in deleted]
+    if added:
+        ops.append(("insert", (added,)))
+    return ops
+
+
+def _replace_unmatched(table, base, ops):
+    # the writes that hit nothing, redone on the current rows by the same
+    # cell-by-cell comparison the editor's frame was made with → rows changed
+    current = datastore.load(table, base.attrs.get("user"))
+    rows = [clean_record(r) for r in current.to_dict(orient="records")]
+    done = 0
+    for method, args in ops:
+        hit = [i for i, r in enumerate(rows) if journal.matches(r, args[0])]
+        if not hit:
+            continue  # deleted or changed by someone else meanwhile
+        done += 1
+        if method == "delete":
+            gone = set(hit)
+            rows = [r for i, r in enumerate(rows) if i not in gone]
+        else:
+            for i in hit:
+                rows[i] = dict(rows[i], **args[1])
+    if done:
+        datastore.replace(table, pd.DataFrame(rows, columns=list(current.columns)), base=current)
+    return done
+
+
+def apply_changes(table, base, changes, defaults=None):
+    """Persist the editor's pending changes → (changes saved, changes pending)."""
+    edited, deleted, added = _deltas(table, changes, defaults)
+    total = len(set(edited) | set(deleted)) + len(added)
+    ops = row_ops(table, base, changes, defaults)
+    if ops is None:
+        rows = [clean_record(r) for r in base.to_dict(orient="records")]
+        for i, v in edited.items():
+            rows[i].update(v)
+        gone = set(deleted)
+        rows = [r for i, r in enumerate(rows) if i not in gone] + added
+        datastore.replace(table, pd.DataFrame(rows, columns=list(base.columns)), base=base)
+        return total, total
+    saved, unmatched = 0, []
+    for method, args in ops:
+        n = getattr(datastore, method)(table, *args)
+        if method == "insert":
+            saved += len(args[0])
+        elif n:
+            saved += 1
+        else:
+            unmatched.append((method, args))
+    if unmatched:
+        saved += _replace_unmatched(table, base, unmatched)
+    return saved, total
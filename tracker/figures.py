@@ -0,0 +1,53 @@
+# ===============================
+# Plotly figure cache keyed by data version
+# ===============================
+# Building a figure with plotly.express (frame wrangling + trace validation) is
+# most of a chart's cost, and most reruns don't touch the data — changing a
+# dropdown reruns every chart on the page. cached() memoizes the finished
+# figure on (chart name, data version, chart params); the version is the
+# datastore stamp of the table the chart is drawn from, so any write produces
+# a new key. A stamp needn't differ between partitions (SQLite's is per
+# table), so a chart drawn from one user's rows passes user= as a param.
+# Figures are shared by every session in the process (treat them as
+# read-only) and evicted LRU once their serialized JSON passes the budget
+# (TRACKER_FIG_CACHE_MB, default 64).
+import os, threading
+from collections import OrderedDict
+
+from tracker import metrics
+
+FIG_CACHE_BUDGET_BYTES = int(os.environ.get("TRACKER_FIG_CACHE_MB", "64")) * 2**20
+
+_lock = threading.Lock()
+_cache = OrderedDict()  # key -> (figure, nbytes)
+stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def cached(name, version, build, **params):
+    key = (name, version, tuple(sorted(params.items())))
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+            stats["hits"] += 1
+            metrics.count("cache_hits", cache="figures", chart=name)
+            return entry[0]
+        stats["misses"] += 1
+    metrics.count("cache_misses", cache="figures", chart=name)
+    with metrics.timer("chart", chart=name):
+        fig = build()
+    nbytes = len(fig.to_json())
+    with _lock:
+        _cache[key] = (fig, nbytes)
+        total = sum(n for _, n in _cache.values())
+        while len(_cache) > 1 and total > FIG_CACHE_BUDGET_BYTES:
+            _, (_, n) = _cache.popitem(last=False)
+            total -= n
+            stats["evictions"] += 1
+            metrics.count("cache_evictions", cache="figures")
+    return fig
+
+
+def clear():
+    with _lock:
+        _cache.clear()
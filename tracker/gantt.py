@@ -0,0 +1,92 @@
+# ===============================
+# Gantt events for the Info Beasiswa timeline
+# ===============================
+# Columnar version of the old per-row loop: each phase's (start, end) column
+# pair becomes one block of the long frame, all dates are parsed in a single
+# vectorized pass per column, and incomplete phases are dropped with a mask.
+# The result (rows, order, index, dtypes) is the same as the loop it replaces:
+#   - a phase is kept when both cells are truthy and not blank, and both parse
+#   - events are listed row by row, phase by phase, then sort_values("Mulai")
+#   - Mulai / Selesai take the finest datetime unit among their kept cells
+# tools/gantt_check.py compares the two on randomized tables.
+# phase_windows() is the same frame before the sort, with "Nama User"; the
+# deadline index (tracker/deadlines.py) is built from it.
+import numpy as np
+import pandas as pd
+
+from tracker.schema import parse_dates
+
+PHASES = [
+    ("Pendaftaran","Periode Pendaftaran (Mulai)","Periode Pendaftaran (Selesai)"),
+    ("Dokumen","Periode Dokumen (Mulai)","Periode Dokumen (Selesai)"),
+    ("Wawancara","Periode Wawancara (Mulai)","Periode Wawancara (Selesai)"),
+    ("Tes","Periode Tes (Mulai)","Periode Tes (Selesai)"),
+    ("Pengumuman","Tanggal Pengumuman","Tanggal Pengumuman")
+]
+GANTT_COLUMNS = ["Beasiswa","Tahap","Mulai","Selesai"]
+WINDOW_COLUMNS = ["Nama User"] + GANTT_COLUMNS
+
+_truthy = np.frompyfunc(bool, 1, 1)
+_UNITS = ["s", "ms", "us", "ns"]
+_TEXT_UNIT = pd.to_datetime("2000-01-01").unit  # what pd.to_datetime gives a date string ("us" on pandas 3)
+_SUB_MICRO = r"\.\d{7}"  # more than 6 fractional digits: that cell parses to "ns"
+
+
+def _present(s):
+    # same test as `row.get(c) and str(row.get(c)).strip()` on an iterrows row,
+    # where missing cells arrive as NaN (truthy) and so count as present
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s.notna().to_numpy()  # typed column (columnar snapshots): NaT was a blank cell
+    missing = s.isna().to_numpy()
+    filled = s.where(~s.isna(), "")
+    return missing | (_truthy(filled.to_numpy(dtype=object)).astype(bool) & filled.astype(str).str.strip().ne("").to_numpy())
+
+
+def _cell_units(s):
+    # per cell, the unit pd.to_datetime(cell) would give it; the loop's frame
+    # took the finest unit among the kept cells of each column
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return np.full(len(s), _UNITS.index(s.dt.unit))
+    fine = s.astype(str).str.contains(_SUB_MICRO, regex=True).to_numpy()
+    return np.where(fine, _UNITS.index("ns"), _UNITS.index(_TEXT_UNIT))
+
+
+def phase_windows(df_scholar):
+    """Every complete phase as one row of WINDOW_COLUMNS, row by row then phase by phase."""
+    if df_scholar.empty:
+        return pd.DataFrame(columns=WINDOW_COLUMNS)
+    cols = {c for _, sc, ec in PHASES for c in (sc, ec)}
+    present, parsed, failed, units = {}, {}, {}, {}
+    for c in cols:
+        s = df_scholar[c].reset_index(drop=True)
+        present[c] = _present(s)
+        parsed[c], failed[c] = parse_dates(s)
+        units[c] = _cell_units(s)
+    rows = np.arange(len(df_scholar))
+    users = df_scholar["Nama User"].to_numpy()
+    beasiswa = df_scholar["Beasiswa"].to_numpy()
+    blocks, start_units, end_units = [], [], []
+    for i, (label, sc, ec) in enumerate(PHASES):
+        ok = present[sc] & present[ec] & ~failed[sc] & ~failed[ec]
+        start_units.append(units[sc][ok])
+        end_units.append(units[ec][ok])
+        blocks.append(pd.DataFrame({
+            "_row": rows[ok], "_phase": i,
+            "Nama User": users[ok], "Beasiswa": beasiswa[ok], "Tahap": label,
+            "Mulai": parsed[sc][ok].to_numpy(), "Selesai": parsed[ec][ok].to_numpy()
+        }))
+    events = pd.concat(blocks, ignore_index=True)
+    if events.empty:
+        return pd.DataFrame(columns=WINDOW_COLUMNS)
+    events = events.sort_values(["_row", "_phase"], kind="stable")[WINDOW_COLUMNS].reset_index(drop=True)
+    events = events.infer_objects()  # same dtypes the list-of-dicts constructor inferred
+    for c, kept in (("Mulai", start_units), ("Selesai", end_units)):
+        events[c] = events[c].astype(f"datetime64[{_UNITS[np.concatenate(kept).max()]}]")
+    return events
+
+
+def build_gantt(df_scholar):
+    events = phase_windows(df_scholar)
+    if events.empty:
+        return pd.DataFrame(columns=GANTT_COLUMNS)
+    return events[GANTT_COLUMNS].sort_values("Mulai")
@@ -0,0 +1,193 @@
+# ===============================
+# Per-user IELTS statistics — maintained view
+# ===============================
+# For each "Nama User": the latest test, best / rolling-mean / mean score per
+# skill (and Overall), weakest and strongest skill, and a least-squares trend
+# of Overall over the test dates with the date that trend reaches the latest
+# Target. Built once from the table with groupby over the typed columns,
+# then updated on each insert / delete like LatestProgressView, so a saved
+# test costs O(ROLLING_TESTS) instead of a pass over every user's history.
+#   - latest = last test after sorting by "Tanggal Tes" (unparseable dates
+#     sort last); among equal dates the later-saved test wins
+#   - the trend keeps running sums (n, Σx, Σy, Σx², Σxy) with x in days, so
+#     an insert updates it in O(1); undated tests don't count towards it
+#   - missing / NaN users are grouped under "" (schema.user_of)
+import threading
+
+import numpy as np
+import pandas as pd
+
+from tracker.schema import IELTS_SKILLS, clean_value, date_sort_key, parse_dates, user_of
+
+SCORES = IELTS_SKILLS + ["Overall"]
+ROLLING_TESTS = 3
+EPOCH = pd.Timestamp("1970-01-01")
+DAY = pd.Timedelta(days=1)
+
+
+def _num(v):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _new_state():
+    return {"latest": None, "best": {}, "recent": [], "sum": dict.fromkeys(SCORES, 0.0),
+            "count": dict.fromkeys(SCORES, 0), "reg": [0, 0.0, 0.0, 0.0, 0.0]}
+
+
+def _copy_state(st):
+    return {"latest": st["latest"], "best": dict(st["best"]), "recent": list(st["recent"]),
+            "sum": dict(st["sum"]), "count": dict(st["count"]), "reg": list(st["reg"])}
+
+
+def _trend(reg):
+    # (slope in bands/day, intercept) of the least-squares line, or None
+    n, sx, sy, sxx, sxy = reg
+    den = n * sxx - sx * sx
+    if n < 2 or den <= 0:
+        return None
+    slope = (n * sxy - sx * sy) / den
+    return slope, (sy - slope * sx) / n
+
+
+class IeltsStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.by_user = {}  # "Nama User" -> state (see _new_state)
+        self._seq = 0
+
+    @classmethod
+    def from_frame(cls, df):
+        view = cls()
+        if df.empty:
+            return view
+        df = df.reset_index(drop=True)
+        n = len(df)
+        dt, _ = parse_dates(df["Tanggal Tes"])
+        scores = df[SCORES + ["Target"]].apply(pd.to_numeric, errors="coerce").astype(float)
+        x = ((dt - EPOCH) / DAY).to_numpy(dtype=float)
+        y = scores["Overall"].to_numpy()
+        fit = ~np.isnan(x) & ~np.isnan(y)
+        xf, yf = np.where(fit, x, 0.0), np.where(fit, y, 0.0)
+        keyed = scores.assign(
+            _user=df["Nama User"].astype(object).where(df["Nama User"].notna(), "").astype(str).to_numpy(),
+            _nat=dt.isna().to_numpy(), _dt=dt.fillna(pd.Timestamp.min).to_numpy(), _seq=np.arange(n),
+            _n=fit.astype(int), _x=xf, _y=yf, _xx=xf * xf, _xy=xf * yf,
+        ).sort_values(["_user", "_nat", "_dt", "_seq"], kind="stable")
+        g = keyed.groupby("_user", sort=False)
+        best, sums, counts = g[SCORES].max(), g[SCORES].sum(), g[SCORES].count()
+        reg = g[["_n", "_x", "_y", "_xx", "_xy"]].sum()
+        records = df.to_dict(orient="records")
+        recent = g.tail(ROLLING_TESTS)
+        for user, rows in recent.groupby("_user", sort=False):
+            st = view.by_user[user] = _new_state()
+            st["recent"] = [((int(nat), d, int(seq)), dict(zip(SCORES, vals)))
+                            for nat, d, seq, vals in zip(rows["_nat"], rows["_dt"], rows["_seq"],
+                                                         rows[SCORES].to_numpy().tolist())]
+            sk = st["recent"][-1][0]
+            st["latest"] = (sk, records[sk[2]])
+            st["best"] = {s: v for s, v in best.loc[user].items() if not pd.isna(v)}
+            st["sum"] = {s: float(v) for s, v in sums.loc[user].items()}
+            st["count"] = {s: int(v) for s, v in counts.loc[user].items()}
+            r = reg.loc[user]
+            st["reg"] = [int(r["_n"]), float(r["_x"]), float(r["_y"]), float(r["_xx"]), float(r["_xy"])]
+        view._seq = n
+        return view
+
+    @classmethod
+    def merge(cls, views):
+        """All-users view from per-user views (their users never overlap)."""
+        out = cls()
+        for v in views:
+            with v._lock:
+                out.by_user.update((u, _copy_state(st)) for u, st in v.by_user.items())
+                out._seq = max(out._seq, v._seq)
+        return out
+
+    # -------------------------------
+    # incremental maintenance
+    # -------------------------------
+    def insert(self, rows):
+        with self._lock:
+            for rec in rows:
+                st = self.by_user.setdefault(user_of(rec), _new_state())
+                vals = {s: _num(rec.get(s)) for s in SCORES}
+                sk = date_sort_key(rec.get("Tanggal Tes"), self._seq)
+                self._seq += 1
+                for s, v in vals.items():
+                    if np.isnan(v):
+                        continue
+                    st["sum"][s] += v
+                    st["count"][s] += 1
+                    if not v <= st["best"].get(s, -np.inf):
+                        st["best"][s] = v
+                if not sk[0] and not np.isnan(vals["Overall"]):
+                    x, y = (sk[1] - EPOCH) / DAY, vals["Overall"]
+                    for i, d in enumerate((1, x, y, x * x, x * y)):
+                        st["reg"][i] += d
+                st["recent"] = sorted(st["recent"] + [(sk, vals)], key=lambda t: t[0])[-ROLLING_TESTS:]
+                if st["latest"] is None or sk > st["latest"][0]:
+                    st["latest"] = (sk, dict(rec))
+
+    def delete(self, match):
+        """Apply a delete filter; False unless it's on "Nama User" only (rebuild instead)."""
+        if set(match) != {"Nama User"}:
+            return False
+        with self._lock:
+            self.by_user.pop(user_of(match), None)
+        return True
+
+    # -------------------------------
+    # page inputs
+    # -------------------------------
+    def users(self):
+        with self._lock:
+            return sorted(self.by_user)
+
+    def skills(self, user):
+        """Per score: latest, best, mean of the last ROLLING_TESTS tests, mean of all tests."""
+        with self._lock:
+            st = _copy_state(self.by_user[user])
+        latest = {s: _num(st["latest"][1].get(s)) for s in SCORES}
+        recent = pd.DataFrame([v for _, v in st["recent"]], columns=SCORES)
+        return pd.DataFrame({
+            "Latest": pd.Series(latest),
+            "Best": pd.Series({s: st["best"].get(s, np.nan) for s in SCORES}),
+            f"Rata-rata {ROLLING_TESTS} tes": recent.mean(),
+            "Rata-rata": pd.Series({s: st["sum"][s] / st["count"][s] if st["count"][s] else np.nan for s in SCORES}),
+        }).rename_axis("Skill")
+
+    def summary(self):
+        """One row per user: latest test, target, gap, trend and projected date, weakest / strongest skill."""
+        with self._lock:
+            states = {u: _copy_state(st) for u, st in self.by_user.items()}
+        out = []
+        for user, st in sorted(states.items()):
+            rec = st["latest"][1]
+            overall, target = _num(rec.get("Overall")), _num(rec.get("Target"))
+            means = {s: st["sum"][s] / st["count"][s] for s in IELTS_SKILLS if st["count"][s]}
+            trend = _trend(st["reg"])
+            if not np.isnan(overall) and overall >= target:
+                projected = pd.NaT if st["latest"][0][0] else st["latest"][0][1]  # already there
+            elif trend is not None and trend[0] > 0 and not np.isnan(target):
+                try:
+                    projected = (EPOCH + (target - trend[1]) / trend[0] * DAY).normalize()
+                except (OverflowError, ValueError):
+                    projected = pd.NaT  # a nearly flat trend lands past the Timestamp range
+                if not st["latest"][0][0] and projected < st["latest"][0][1]:
+                    projected = pd.NaT  # the fitted line passed the target before the latest (still short) test
+            else:
+                projected = pd.NaT
+            out.append({
+                "Nama User": user, "Tes": st["count"]["Overall"], "Tanggal Tes": clean_value(rec.get("Tanggal Tes", "")),
+                "Overall": overall, "Target": target, "Gap": round(target - overall, 1),
+                "Best Overall": st["best"].get("Overall", np.nan),
+                f"Rata-rata {ROLLING_TESTS} tes": pd.Series([v["Overall"] for _, v in st["recent"]], dtype=float).mean(),
+                "Tren / 30 hari": np.nan if trend is None else round(trend[0] * 30, 2),
+                "Proyeksi Target": projected,
+                "Terkuat": max(means, key=means.get) if means else None,
+                "Terlemah": min(means, key=means.get) if means else None,
+            })
+        return pd.DataFrame(out)
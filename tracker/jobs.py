@@ -0,0 +1,88 @@
+# ===============================
+# In-process background worker
+# ===============================
+# A small thread pool (TRACKER_JOB_WORKERS, default 2) for work that doesn't
+# have to finish inside a rerun: journal compaction (journal.py), rebuilding
+# derived views after a write (datastore.derived_latest) and compressing reset
+# backups (backups.py). Jobs are keyed; submitting a key that is still queued
+# returns the queued job, so a burst of writes doesn't pile up rebuilds of the
+# same view. Once a job has started it may be working on older data, so the
+# next submit of its key queues a new one.
+#
+# The pool's threads are not daemons: the interpreter waits for queued jobs
+# at exit, so a CLI tool that triggers a compaction or a backup still ends
+# with it done. Failures are logged on "tracker.jobs" and counted in stats.
+# The threads share the GIL with the reruns, so pandas-heavy jobs still slow
+# them a little; they just never make one wait.
+import logging, os, threading
+from concurrent.futures import ThreadPoolExecutor, wait as _wait
+
+from tracker import metrics
+
+WORKERS = int(os.environ.get("TRACKER_JOB_WORKERS", "2"))
+
+log = logging.getLogger("tracker.jobs")
+_lock = threading.Lock()
+_pool = None
+_queued = {}  # key -> Future not started yet
+_active = set()  # Futures queued or running
+stats = {"submitted": 0, "coalesced": 0, "done": 0, "failed": 0}
+
+
+def _executor():
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="tracker-job")
+    return _pool
+
+
+def _run(key, fn, args):
+    with _lock:
+        _queued.pop(key, None)
+    try:
+        with metrics.timer("job", kind=key[0]):
+            return fn(*args)
+    except Exception:
+        log.exception("job %s failed", key)
+        with _lock:
+            stats["failed"] += 1
+        raise
+    finally:
+        with _lock:
+            stats["done"] += 1
+
+
+def submit(key, fn, *args):
+    """Queue fn(*args) on the pool → Future; joins a still-queued job of the same key. key[0] names the kind."""
+    with _lock:
+        fut = _queued.get(key)
+        if fut is not None:
+            stats["coalesced"] += 1
+            return fut
+        stats["submitted"] += 1
+        fut = _queued[key] = _executor().submit(_run, key, fn, args)
+        _active.add(fut)
+    fut.add_done_callback(_forget)
+    return fut
+
+
+def _forget(fut):
+    with _lock:
+        _active.discard(fut)
+
+
+def pending():
+    with _lock:
+        return len(_active)
+
+
+def wait(timeout=None):
+    """Block until no job is queued or running, including ones submitted meanwhile."""
+    while True:
+        with _lock:
+            futures = list(_active)
+        if not futures:
+            return
+        done, _ = _wait(futures, timeout=timeout)
+        if timeout is not None and len(done) < len(futures):
+            return
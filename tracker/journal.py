@@ -0,0 +1,295 @@
+# ===============================
+# Append-only journal for the tracker JSON files
+# ===============================
+# Each table is a snapshot plus a journal next to it:
+#
+#   data_progress.json       snapshot — legacy JSON list of records, or
+#                            {"seq": N, "rows": [...]} once compacted
+#   data_progress.json.log   journal — one JSON op per line, each with a "seq"
+#
+# A save appends one line, so its cost tracks the size of the change instead of
+# the size of the table. Compaction folds the journal into a new snapshot
+# (temp file + rename) on the background worker (tracker/jobs.py), holding the
+# exclusive lock only for the swap (compact). Ops with seq <= snapshot seq are
+# skipped on replay, so a crash between the snapshot rename and the journal
+# trim never applies an op twice; a torn last line (crash mid-append) is
+# ignored.
+#
+# The last seq doubles as the table's version. Writes hold the table's file
+# lock (tracker/concurrency.py), so seqs stay unique across processes, and
+# readers take it shared so they never see a snapshot without its journal.
+#
+# With TRACKER_SNAPSHOT=arrow each snapshot also gets a typed columnar copy
+# (tracker/columnar.py); load_frame() starts from that copy when it's current.
+import json, os, re, threading
+
+from tracker import columnar, jobs, metrics
+from tracker.concurrency import locked, merge_rows
+from tracker.schema import clean_record
+
+JOURNAL_SUFFIX = ".log"
+COMPACT_BYTES = 1 << 20  # fold the journal into the snapshot once it passes ~1 MB
+
+
+def journal_path(path):
+    return path + JOURNAL_SUFFIX
+
+
+def matches(row, match):
+    # a key a stored row lacks is a blank cell, as to_frame() fills it
+    return all(row.get(k, "") == v for k, v in match.items())
+
+
+# -------------------------------
+# read side
+# -------------------------------
+def read_snapshot(path):
+    if not os.path.exists(path):
+        return 0, []
+    with open(path, "r", encoding="utf-8") as f:
+        s = f.read().strip()
+        metrics.count("bytes_read", os.fstat(f.fileno()).st_size, table=columnar.table_of(path))
+    if not s:
+        return 0, []
+    data = json.loads(s)
+    if isinstance(data, dict):
+        return int(data.get("seq", 0)), data.get("rows", [])
+    return 0, data
+
+
+def read_journal(path):
+    jpath = journal_path(path)
+    if not os.path.exists(jpath):
+        return []
+    ops = []
+    with open(jpath, "r", encoding="utf-8") as f:
+        metrics.count("bytes_read", os.fstat(f.fileno()).st_size, table=columnar.table_of(path))
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                ops.append(json.loads(line))
+            except ValueError:
+                # torn write from a crash mid-append; everything before it is intact
+                continue
+    return ops
+
+
+def apply_op(rows, op):
+    kind = op.get("op")
+    if kind == "ins":
+        rows.extend(op["rows"])
+    elif kind == "del":
+        match = op["match"]
+        rows[:] = [r for r in rows if not matches(r, match)]
+    elif kind == "upd":
+        match, values = op["match"], op["set"]
+        rows[:] = [dict(r, **values) if matches(r, match) else r for r in rows]
+    return rows
+
+
+def load_records(path):
+    """Snapshot + journal replay → (rows, last seq)."""
+    with locked(path, shared=True):
+        seq, rows = read_snapshot(path)
+        ops = read_journal(path)
+    return replay(rows, seq, ops)
+
+
+def replay(rows, seq, ops):
+    for op in ops:
+        if op.get("seq", 0) <= seq:
+            continue
+        apply_op(rows, op)
+        seq = op["seq"]
+    return rows, seq
+
+
+def load_frame(path, table):
+    """load_records as a typed frame (columnar.typed), for TRACKER_SNAPSHOT=arrow.
+
+    Pending inserts are appended as frames; a pending delete/update goes back
+    through the records so it matches exactly what load_records would do.
+    """
+    with locked(path, shared=True):
+        seq = _snapshot_seq(path) if os.path.exists(path) else None
+        df = None if seq is None else columnar.read(path, seq)
+        if df is None:
+            seq, rows = read_snapshot(path)
+        ops = [op for op in read_journal(path) if op.get("seq", 0) > seq]
+    if df is not None and all(op.get("op") == "ins" for op in ops):
+        frames = [df] + [columnar.records_frame(table, op["rows"]) for op in ops]
+        df = columnar.concat(table, frames) if ops else df
+    else:
+        if df is not None:
+            rows = [clean_record(r) for r in df.to_dict(orient="records")]
+        for op in ops:
+            apply_op(rows, op)
+        df = columnar.records_frame(table, rows)
+    return df, (ops[-1]["seq"] if ops else seq)
+
+
+# -------------------------------
+# write side
+# -------------------------------
+def _last_seq(path, tail_bytes=65536):
+    jpath = journal_path(path)
+    size = os.path.getsize(jpath) if os.path.exists(jpath) else 0
+    if size:
+        # only the tail is needed; fall back to a full scan for very long lines
+        with open(jpath, "rb") as f:
+            f.seek(max(0, size - tail_bytes))
+            tail = f.read().decode("utf-8", errors="ignore").splitlines()
+        for line in reversed(tail):
+            try:
+                op = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(op, dict) and "seq" in op:
+                return op["seq"]
+        for op in reversed(read_journal(path)):
+            if "seq" in op:
+                return op["seq"]
+    return _snapshot_seq(path)
+
+
+def _snapshot_seq(path):
+    # compacted snapshots start with {"seq": N, ...}; legacy lists are seq 0
+    if not os.path.exists(path):
+        return 0
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(64).lstrip()
+    m = re.match(r'\{"seq":\s*(\d+)', head)
+    return int(m.group(1)) if m else 0
+
+
+def current_seq(path):
+    with locked(path, shared=True):
+        return _last_seq(path)
+
+
+def append(path, op):
+    with locked(path):
+        jpath = journal_path(path)
+        op = dict(op, seq=_last_seq(path) + 1)
+        line = json.dumps(op, ensure_ascii=False) + "\n"
+        with open(jpath, "a+b") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = "\n" + line  # terminate a torn line so it stays isolated
+            data = line.encode("utf-8")
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        size = os.path.getsize(jpath)
+    metrics.count("bytes_written", len(data), table=columnar.table_of(path))
+    if size >= COMPACT_BYTES:
+        schedule_compaction(path)
+    return op["seq"]
+
+
+def append_rows(path, rows):
+    return append(path, {"op": "ins", "rows": [clean_record(r) for r in rows]})
+
+
+def delete_rows(path, match):
+    return append(path, {"op": "del", "match": clean_record(match)})
+
+
+def _write_snapshot(path, rows, seq):
+    # temp file + rename: readers see the old snapshot or the new one, never half
+    columnar.write(path, rows, seq)
+    os.replace(_stage_snapshot(path, rows, seq), path)
+    jpath = journal_path(path)
+    if os.path.exists(jpath):
+        os.remove(jpath)
+
+
+def _stage_snapshot(path, rows, seq):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"seq": seq, "rows": rows}, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+        metrics.count("bytes_written", os.fstat(f.fileno()).st_size, table=columnar.table_of(path))
+    return tmp
+
+
+def _identity(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def update_rows(path, match, values):
+    return append(path, {"op": "upd", "match": clean_record(match), "set": clean_record(values)})
+
+
+def compact(path):
+    """Fold the journal into a new snapshot → its seq (None when overtaken).
+
+    Only the final swap holds the exclusive lock: the replay and the dumps run
+    on what was read under a brief shared lock, while reruns keep reading and
+    writers keep appending. The swap then renames the new snapshot into place
+    and keeps only the journal bytes appended since (ops past its seq). If the
+    snapshot itself changed meanwhile (a whole-table save, a reset) that one
+    wins and the staged files are dropped.
+    """
+    jpath = journal_path(path)
+    with locked(path, shared=True):
+        before = _identity(path)
+        seq, rows = read_snapshot(path)
+        ops = read_journal(path)
+        offset = os.path.getsize(jpath) if os.path.exists(jpath) else 0
+    rows, seq = replay(rows, seq, ops)
+    arrow_tmp = columnar.stage(path, rows, seq)
+    tmp = _stage_snapshot(path, rows, seq)
+    with locked(path):
+        if _identity(path) != before:
+            for t in (tmp, arrow_tmp):
+                if t is not None:
+                    os.remove(t)
+            return None
+        tail = b""
+        if os.path.exists(jpath):
+            with open(jpath, "rb") as f:
+                f.seek(offset)
+                tail = f.read()
+        columnar.publish(path, arrow_tmp)
+        os.replace(tmp, path)
+        # a crash before the journal is trimmed is harmless: ops <= seq are skipped
+        if tail.strip():
+            jtmp = jpath + f".{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(jtmp, "wb") as f:
+                f.write(tail)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(jtmp, jpath)
+        elif os.path.exists(jpath):
+            os.remove(jpath)
+    return seq
+
+
+def replace_rows(path, rows, base_rows=None, base_seq=None, columns=None):
+    """Whole-table rewrite, for editors that hand back the full frame.
+
+    With base_rows/base_seq (what the editor started from), a save whose base
+    is no longer current is merged onto the current rows instead of
+    overwriting what other sessions wrote since.
+    """
+    rows = [clean_record(r) for r in rows]
+    with locked(path):
+        current_rows, seq = load_records(path)
+        if base_seq is not None and base_seq != seq:
+            rows = merge_rows(current_rows, [clean_record(r) for r in base_rows], rows, columns)
+        _write_snapshot(path, rows, seq + 1)
+    return seq + 1
+
+
+def schedule_compaction(path):
+    jobs.submit(("compact", path), compact, path)
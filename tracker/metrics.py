@@ -0,0 +1,218 @@
+# ===============================
+# Opt-in hot-path instrumentation: timers, counters, export
+# ===============================
+# Off unless TRACKER_METRICS=1 (or one of the exports below is configured);
+# while off, timer() hands back a shared no-op context and count() returns at
+# once, so the calls can stay on every hot path.
+#
+#   timer(step, **labels)       wall time of a step: load, save, build (a
+#                               derived view), chart (figure build), render ...
+#   count(name, n, **labels)    rows, bytes_read, bytes_written, cache_hits,
+#                               cache_misses, cache_evictions
+#
+# Everything is summed process-wide per (name, labels). A page brackets its
+# run with begin(page) / finish(page), which also collects that run's own
+# steps for the debug sidebar (ui.debug_sidebar); Streamlit runs each session
+# in its own thread, so the run in progress is thread-local. Steps nest (a
+# view build includes the load under it), and fragment reruns only count
+# towards the process totals.
+#
+# Export:
+#   prometheus()                Prometheus text format; snapshot() the same as JSON
+#   TRACKER_METRICS_FILE=path   one JSON line per finished page run
+#   TRACKER_METRICS_PORT=9108   http://127.0.0.1:9108/metrics (Prometheus) and
+#                               /metrics.json, served from a daemon thread
+import contextlib, json, logging, os, threading, time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tracker import startup
+
+log = logging.getLogger("tracker.metrics")
+FILE = os.environ.get("TRACKER_METRICS_FILE", "")
+PORT = int(os.environ.get("TRACKER_METRICS_PORT", "0") or 0)
+ENABLED = os.environ.get("TRACKER_METRICS", "") not in ("", "0") or bool(FILE) or bool(PORT)
+
+_lock = threading.Lock()
+_timers = {}  # (step, labels) -> [count, seconds, max seconds]
+_counters = {}  # (name, labels) -> value
+_local = threading.local()
+_server = None
+_NULL = contextlib.nullcontext()
+
+
+def enable(on=True):
+    global ENABLED
+    ENABLED = on
+
+
+def reset():
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Timer:
+    __slots__ = ("key", "t0")
+
+    def __init__(self, key):
+        self.key = key
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _record(_timers, self.key, time.perf_counter() - self.t0, timed=True)
+        return False
+
+
+def _record(table, key, value, timed=False):
+    run = getattr(_local, "run", None)
+    with _lock:
+        for t in (table, None if run is None else run["timers" if timed else "counters"]):
+            if t is None:
+                continue
+            if timed:
+                e = t.setdefault(key, [0, 0.0, 0.0])
+                e[0] += 1
+                e[1] += value
+                e[2] = max(e[2], value)
+            else:
+                t[key] = t.get(key, 0) + value
+
+
+def timer(step, **labels):
+    if not ENABLED:
+        return _NULL
+    return _Timer(_key(step, labels))
+
+
+def count(name, n=1, **labels):
+    if ENABLED and n:
+        _record(_counters, _key(name, labels), n)
+
+
+def _steps(timers):
+    return [{"step": name, **dict(labels), "count": c, "seconds": round(s, 6), "max_seconds": round(m, 6)}
+            for (name, labels), (c, s, m) in sorted(timers.items())]
+
+
+def _counts(counters):
+    return [{"name": name, **dict(labels), "value": v} for (name, labels), v in sorted(counters.items())]
+
+
+# -------------------------------
+# page runs
+# -------------------------------
+def begin(page):
+    if not ENABLED:
+        return
+    if PORT:
+        serve(PORT)
+    _local.run = {"page": page, "t0": time.perf_counter(), "timers": {}, "counters": {}}
+
+
+def finish(page, **extra):
+    """End the thread's run → its record (None when off / not begun); appended to TRACKER_METRICS_FILE."""
+    run = getattr(_local, "run", None)
+    _local.run = None
+    if run is None or run["page"] != page:
+        return None
+    record = {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"), "page": page,
+        "seconds": round(time.perf_counter() - run["t0"], 6), **extra,
+        "steps": _steps(run["timers"]), "counters": _counts(run["counters"]),
+    }
+    count("page_runs", page=page)
+    if FILE:
+        with _lock, open(FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return record
+
+
+# -------------------------------
+# export
+# -------------------------------
+def snapshot():
+    with _lock:
+        timers = {k: list(v) for k, v in _timers.items()}
+        counters = dict(_counters)
+    return {
+        "steps": _steps(timers), "counters": _counts(counters),
+        "startup": {"cold": dict(startup.cold), "warm": dict(startup.warm)},
+    }
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    esc = lambda v: v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in pairs) + "}"
+
+
+def prometheus():
+    with _lock:
+        timers = sorted(_timers.items())
+        counters = sorted(_counters.items())
+    out = ["# HELP tracker_step_seconds Wall time of instrumented steps.",
+           "# TYPE tracker_step_seconds summary"]
+    for (name, labels), (c, s, _) in timers:
+        lb = _labels((("step", name),) + labels)
+        out += [f"tracker_step_seconds_sum{lb} {s:.6f}", f"tracker_step_seconds_count{lb} {c}"]
+    out += ["# HELP tracker_step_seconds_max Slowest single run of each step.",
+            "# TYPE tracker_step_seconds_max gauge"]
+    out += [f"tracker_step_seconds_max{_labels((('step', name),) + labels)} {m:.6f}"
+            for (name, labels), (_, _, m) in timers]
+    seen = set()
+    for (name, labels), v in counters:
+        if name not in seen:
+            seen.add(name)
+            out.append(f"# TYPE tracker_{name}_total counter")
+        out.append(f"tracker_{name}_total{_labels(labels)} {v}")
+    out += ["# HELP tracker_page_seconds Import and paint time of the first (cold) and latest (warm) run.",
+            "# TYPE tracker_page_seconds gauge"]
+    for kind, runs in (("cold", dict(startup.cold)), ("warm", dict(startup.warm))):
+        for page, run in sorted(runs.items()):
+            for phase, s in run.items():
+                out.append(f"tracker_page_seconds{_labels((('page', page), ('phase', phase), ('run', kind)))} {s:.6f}")
+    return "\n".join(out) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, ctype = prometheus().encode(), "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path == "/metrics.json":
+            body, ctype = json.dumps(snapshot(), ensure_ascii=False).encode(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port):
+    """Start the local endpoint once per process (another worker may already hold the port)."""
+    global _server
+    with _lock:
+        if _server is not None:
+            return _server
+        try:
+            _server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        except OSError as e:
+            log.warning("metrics endpoint not started on port %s: %s", port, e)
+            _server = False
+            return _server
+    threading.Thread(target=_server.serve_forever, name="tracker-metrics", daemon=True).start()
+    return _server
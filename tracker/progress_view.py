@@ -0,0 +1,135 @@
+# ===============================
+# Latest progress per (Beasiswa, Nama User) — maintained view
+# ===============================
+# Holds, per (Beasiswa, Nama User) key, the latest record with its completion
+# percent, plus the status counts over the whole history (what the status pie
+# shows). It's built once from the table and then updated on each insert /
+# delete, so the progress charts cost O(number of keys) instead of
+# O(history length). Semantics match the old per-rerun pipeline:
+#   - latest = last row after sorting by "Terakhir Diperbarui" (unparseable
+#     dates sort last); among equal dates the later-saved row wins
+#   - rows with a missing Beasiswa / Nama User count in the pie but have no
+#     latest record (groupby drops NaN keys)
+import threading
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from tracker.schema import STATUS_COLUMNS, date_sort_key, parse_dates
+
+KEY = ["Beasiswa", "Nama User"]
+
+
+def pct_complete(statuses):
+    done = sum(1 for s in statuses if str(s).lower() == "selesai")
+    return int(round(done / len(STATUS_COLUMNS) * 100))
+
+
+def _norm(v):
+    return None if pd.isna(v) else v
+
+
+class LatestProgressView:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latest = {}      # key -> (sort key, record, percent)
+        self.key_counts = {}  # key -> Counter of statuses over all of the key's rows
+        self.status_counts = Counter()
+        self._seq = 0
+
+    @classmethod
+    def from_frame(cls, df):
+        view = cls()
+        if df.empty:
+            return view
+        df = df.reset_index(drop=True)
+        n = len(df)
+        dt, _ = parse_dates(df["Terakhir Diperbarui"])
+        keyed = df.assign(
+            _nat=dt.isna().to_numpy(), _dt=dt.fillna(pd.Timestamp.min).to_numpy(), _seq=np.arange(n),
+            Percent=(df[STATUS_COLUMNS].astype(str).apply(lambda s: s.str.lower()) == "selesai").sum(axis=1)
+                     .mul(100 / len(STATUS_COLUMNS)).round().astype(int)
+        )
+        latest = (keyed.dropna(subset=KEY)
+                  .sort_values(["_nat", "_dt", "_seq"], kind="stable")
+                  .drop_duplicates(KEY, keep="last"))
+        cols = list(df.columns)
+        for rec, nat, d, seq, pct in zip(latest[cols].to_dict(orient="records"), latest["_nat"],
+                                         latest["_dt"], latest["_seq"], latest["Percent"]):
+            view.latest[(rec["Beasiswa"], rec["Nama User"])] = ((int(nat), d, int(seq)), rec, int(pct))
+        long = df[KEY + STATUS_COLUMNS].melt(id_vars=KEY, value_name="Status").dropna(subset=["Status"])
+        for (b, u, status), cnt in long.groupby(KEY + ["Status"], dropna=False, sort=False, observed=True).size().items():
+            view.key_counts.setdefault((_norm(b), _norm(u)), Counter())[status] += int(cnt)
+            view.status_counts[status] += int(cnt)
+        view._seq = n
+        return view
+
+    @classmethod
+    def merge(cls, views):
+        """All-users view from per-user views (their keys never overlap)."""
+        out = cls()
+        for v in views:
+            with v._lock:
+                out.latest.update(v.latest)
+                for key, counts in v.key_counts.items():
+                    out.key_counts[key] = Counter(counts)
+                out.status_counts.update(v.status_counts)
+                out._seq = max(out._seq, v._seq)
+        return out
+
+    # -------------------------------
+    # incremental maintenance
+    # -------------------------------
+    def insert(self, rows):
+        with self._lock:
+            for rec in rows:
+                key = (_norm(rec.get("Beasiswa")), _norm(rec.get("Nama User")))
+                statuses = [rec.get(c, "") for c in STATUS_COLUMNS]
+                counts = self.key_counts.setdefault(key, Counter())
+                for s in statuses:
+                    if not pd.isna(s):
+                        counts[s] += 1
+                        self.status_counts[s] += 1
+                sk = date_sort_key(rec.get("Terakhir Diperbarui"), self._seq)
+                self._seq += 1
+                if None in key:
+                    continue
+                old = self.latest.get(key)
+                if old is None or sk > old[0]:
+                    self.latest[key] = (sk, dict(rec), pct_complete(statuses))
+
+    def delete(self, match):
+        """Apply a delete filter; False when it isn't on the key columns (rebuild instead)."""
+        if not match or set(match) - set(KEY):
+            return False
+        with self._lock:
+            for key in [k for k in self.key_counts if all(k[KEY.index(c)] == v for c, v in match.items())]:
+                self.status_counts.subtract(self.key_counts.pop(key))
+                self.latest.pop(key, None)
+            self.status_counts = +self.status_counts  # drop zero counts
+        return True
+
+    # -------------------------------
+    # chart / filter inputs
+    # -------------------------------
+    def users(self):
+        with self._lock:
+            return sorted({k[1] for k in self.key_counts if k[1] is not None}, key=str)
+
+    def scholarships(self):
+        with self._lock:
+            return sorted({k[0] for k in self.key_counts if k[0] is not None}, key=str)
+
+    def avg_percent(self):
+        with self._lock:
+            items = [(key[0], pct) for key, (_, _, pct) in self.latest.items()]
+        if not items:
+            return pd.DataFrame(columns=["Beasiswa", "Percent"])
+        df = pd.DataFrame(items, columns=["Beasiswa", "Percent"])
+        return df.groupby("Beasiswa", as_index=False)["Percent"].mean().sort_values("Percent", ascending=False)
+
+    def status_dist(self):
+        with self._lock:
+            items = sorted(self.status_counts.items())
+        return pd.DataFrame(items, columns=["Status", "Jumlah"])
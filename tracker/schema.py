@@ -0,0 +1,129 @@
+# ===============================
+# Column schemas for the three tracker tables
+# ===============================
+from datetime import date, datetime
+
+import pandas as pd
+
+SCHOLAR_FILE = "data_scholarship.json"
+PROGRESS_FILE = "data_progress.json"
+IELTS_FILE = "ielts_data.json"
+
+SCHOLAR_COLUMNS = [
+    "Nama User","Negara","Beasiswa","Link Beasiswa","IELTS","GPA",
+    "Other Requirements","Benefit Scholarship",
+    "Periode Pendaftaran (Mulai)","Periode Pendaftaran (Selesai)",
+    "Periode Dokumen (Mulai)","Periode Dokumen (Selesai)",
+    "Periode Wawancara (Mulai)","Periode Wawancara (Selesai)",
+    "Periode Tes (Mulai)","Periode Tes (Selesai)",
+    "Tanggal Pengumuman"
+]
+
+STATUS_COLUMNS = ["Status Pendaftaran","Status Dokumen","Status Wawancara","Status Tes","Status Pengumuman"]
+STATUS_VALUES = ["Belum","Proses","Selesai"]
+
+PROGRESS_COLUMNS = ["Nama User","Beasiswa"] + STATUS_COLUMNS + ["Catatan","Terakhir Diperbarui"]
+
+IELTS_SKILLS = ["Listening","Reading","Writing","Speaking"]
+IELTS_COLUMNS = ["Nama User","Tanggal Tes"] + IELTS_SKILLS + ["Overall","Target","Catatan"]
+IELTS_NUMERIC = IELTS_SKILLS + ["Overall","Target"]
+
+# table name -> (default file, columns, numeric columns)
+TABLES = {
+    "scholar": (SCHOLAR_FILE, SCHOLAR_COLUMNS, []),
+    "progress": (PROGRESS_FILE, PROGRESS_COLUMNS, []),
+    "ielts": (IELTS_FILE, IELTS_COLUMNS, IELTS_NUMERIC),
+}
+
+# typed columns for the columnar snapshots (tracker/columnar.py): ISO dates,
+# and low-cardinality text stored as categories. Not the IELTS names — the
+# editor would turn a category column into a fixed dropdown.
+DATE_COLUMNS = {
+    "scholar": [c for c in SCHOLAR_COLUMNS if c.startswith(("Periode", "Tanggal"))],
+    "progress": ["Terakhir Diperbarui"],
+    "ielts": ["Tanggal Tes"],
+}
+CATEGORY_COLUMNS = {
+    "scholar": ["Nama User", "Negara"],
+    "progress": ["Nama User", "Beasiswa"] + STATUS_COLUMNS,
+    "ielts": [],
+}
+
+
+def clean_value(x):
+    # how a cell is stored: dates as ISO strings, missing as ""
+    if type(x) is str:
+        return x  # most cells; skips the pd.isna call
+    try:
+        if pd.isna(x):
+            return ""
+    except (TypeError, ValueError):
+        pass
+    if isinstance(x, pd.Timestamp) and x == x.normalize():
+        return x.date().isoformat()  # typed date cell → the "YYYY-MM-DD" it was read from
+    if isinstance(x, (date, datetime)):
+        return x.isoformat()
+    return x.item() if hasattr(x, "item") else x
+
+
+def clean_record(row):
+    return {k: clean_value(v) for k, v in row.items()}
+
+
+def user_of(row):
+    # partition key; missing / NaN users all land in the "" partition
+    u = clean_value(row.get("Nama User", ""))
+    return str(u) if u != "" else ""
+
+
+def group_by_user(rows):
+    groups = {}
+    for r in rows:
+        groups.setdefault(user_of(r), []).append(r)
+    return groups
+
+
+def empty_df(table):
+    return pd.DataFrame(columns=TABLES[table][1])
+
+
+def to_frame(table, rows):
+    """Records → DataFrame with every schema column present."""
+    if not rows:
+        return empty_df(table)
+    return conform(table, pd.DataFrame(rows))
+
+
+def conform(table, df):
+    _, columns, numeric = TABLES[table]
+    for c in columns:
+        if c not in df.columns:
+            df[c] = ""
+    for c in numeric:
+        df[c] = pd.to_numeric(df[c], errors="coerce")
+    return df
+
+
+def parse_dates(s):
+    """Vectorized pd.to_datetime with coerce → (parsed, failed mask).
+
+    Saved dates are ISO strings, so the fast ISO8601 path handles nearly
+    everything; leftovers are retried one format at a time like the scalar
+    parser would. Missing cells (NaN) parse to NaT without counting as failed.
+    """
+    parsed = pd.to_datetime(s, errors="coerce", format="ISO8601")
+    retry = parsed.isna() & s.notna()
+    if retry.any():
+        parsed = parsed.astype(object)
+        parsed[retry] = pd.to_datetime(s[retry], errors="coerce", format="mixed")
+        parsed = pd.to_datetime(parsed)
+    return parsed, (parsed.isna() & s.notna()).to_numpy()
+
+
+def date_sort_key(value, seq):
+    """Sort key of one dated row for the maintained views: (is_nat, date, seq).
+
+    NaT sorts after every real date; ties go by save order (seq).
+    """
+    dt = parse_dates(pd.Series([value], dtype=object))[0].iloc[0]
+    return (1, pd.Timestamp.min, seq) if pd.isna(dt) else (0, dt, seq)
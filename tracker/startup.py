@@ -0,0 +1,33 @@
+# ===============================
+# Import and first-paint timing for the pages
+# ===============================
+# A page takes t0 = time.perf_counter() before its imports, then calls
+# imported(page, t0) once they're done and painted(page, t0) as its last
+# statement. Modules stay imported for the life of the server process, so
+# only the first run of a page in a process pays for its imports; that run is
+# kept apart ("cold") from the latest one ("warm"). Every run is logged on the
+# "tracker.startup" logger; TRACKER_TIMING=1 also shows it in the sidebar.
+import logging, os, threading, time
+
+log = logging.getLogger("tracker.startup")
+SHOW = os.environ.get("TRACKER_TIMING", "") not in ("", "0")
+
+_lock = threading.Lock()
+_pending = {}  # page -> import seconds of the run in progress
+cold = {}  # page -> {"imports": s, "paint": s} of the first run in this process
+warm = {}  # page -> the same for the latest run
+
+
+def imported(page, t0):
+    with _lock:
+        _pending[page] = time.perf_counter() - t0
+
+
+def painted(page, t0):
+    run = {"imports": _pending.pop(page, 0.0), "paint": time.perf_counter() - t0}
+    with _lock:
+        kind = "warm" if page in cold else "cold"
+        (warm if kind == "warm" else cold)[page] = run
+    log.info("%s %s run: imports %.3fs, paint %.3fs", page, kind, run["imports"], run["paint"])
+    return kind, run
+
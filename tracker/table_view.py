@@ -0,0 +1,48 @@
+# ===============================
+# Server-side filter / sort / pagination for the progress table
+# ===============================
+# Only the visible page is turned into HTML, so the payload stays the same size
+# however long the history gets. Sorting uses an argsort on the one sort column
+# and takes the page's slice of positions; the other columns of rows outside
+# the page are never touched.
+import math
+
+import numpy as np
+import pandas as pd
+
+from tracker.schema import STATUS_COLUMNS
+
+PROGRESS_TABLE_COLUMNS = ["Nama User","Beasiswa"] + STATUS_COLUMNS + ["Terakhir Diperbarui"]
+PAGE_SIZES = [10, 25, 50, 100]
+
+
+def filter_rows(df, users=None, beasiswa=None, status=None):
+    mask = pd.Series(True, index=df.index)
+    if users:
+        mask &= df["Nama User"].isin(users)
+    if beasiswa:
+        mask &= df["Beasiswa"].isin(beasiswa)
+    if status:
+        # a row matches when any stage has the selected status
+        mask &= df[STATUS_COLUMNS].eq(status).any(axis=1)
+    return df[mask]
+
+
+def page_of(df, sort_by=None, ascending=True, page=1, page_size=25):
+    """→ (rows of the requested page, total rows, number of pages)."""
+    total = len(df)
+    n_pages = max(1, math.ceil(total / page_size))
+    page = min(max(1, page), n_pages)
+    start, stop = (page - 1) * page_size, page * page_size
+    if sort_by:
+        # ranks of the sorted distinct values, flipped for descending, so ties keep
+        # table order either way; missing cells (-1) go last like sort_values
+        codes, uniques = pd.factorize(df[sort_by].astype(str), sort=True)
+        ranks = codes if ascending else len(uniques) - 1 - codes
+        order = np.where(codes < 0, len(uniques), ranks).argsort(kind="stable")
+        return df.iloc[order[start:stop]], total, n_pages
+    return df.iloc[start:stop], total, n_pages
+
+
+def render_html(page_df):
+    return page_df[PROGRESS_TABLE_COLUMNS].to_html(escape=False, index=False, classes="data-table")
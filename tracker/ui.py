@@ -0,0 +1,121 @@
+# ===============================
+# Streamlit widgets shared by the pages
+# ===============================
+import json
+
+import streamlit as st
+
+from tracker import bulk, datastore, metrics, startup
+
+ALL_USERS = "🌐 Semua User (admin)"
+
+# @fragment: a widget change inside the decorated section reruns only that
+# section (st.fragment, or st.experimental_fragment on older Streamlit)
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda f: f)
+
+
+def user_selector():
+    """Sidebar picker for the session's user; None means the all-users view.
+
+    The choice lives in session_state["tracker_user"] so it survives page
+    switches (widget state is dropped when a page doesn't draw the widget);
+    the widget has a fixed key and is seeded from it, and on_change copies a
+    pick back. Only the chosen user's partition is loaded.
+    """
+    options = [ALL_USERS] + datastore.users()
+    current = st.session_state.get("tracker_user", ALL_USERS)
+    if current not in options:
+        current = ALL_USERS
+    st.session_state["tracker_user_pick"] = current
+    choice = st.sidebar.selectbox(
+        "👤 User aktif", options, key="tracker_user_pick", format_func=lambda u: u or "(tanpa nama)",
+        on_change=lambda: st.session_state.update(tracker_user=st.session_state["tracker_user_pick"]),
+    )
+    st.session_state["tracker_user"] = choice
+    return None if choice == ALL_USERS else choice
+
+
+def bulk_panel(table, active_user):
+    """Import a CSV / Excel file into `table` (or download the table) in one go.
+
+    The upload widget gets a fresh key after each import, and the report is
+    shown on the rerun that follows, so the page below reads the new rows.
+    """
+    gen_key = f"bulk_gen_{table}"
+    gen = st.session_state.get(gen_key, 0)
+    with st.expander("📦 Import / Export massal (CSV / Excel)"):
+        report = st.session_state.pop(f"bulk_report_{table}", None)
+        if report is not None:
+            st.success(f"✅ {report['imported']} baris diimpor dalam {report['seconds']:.1f} s · "
+                       f"{report['existing']} sudah ada · {report['duplicates']} duplikat di file · "
+                       f"{report['invalid']} tidak valid")
+            if report["ignored_columns"]:
+                st.caption("Kolom diabaikan: " + ", ".join(report["ignored_columns"]))
+            if report["errors"]:
+                st.dataframe([{"Baris": line, "Masalah": msg} for line, msg in report["errors"]],
+                             use_container_width=True, hide_index=True)
+        kinds = bulk.formats()
+        upload = st.file_uploader("File (baris pertama = nama kolom)", type=kinds, key=f"bulk_file_{table}_{gen}")
+        if upload is not None and st.button("📥 Import", key=f"bulk_import_{table}"):
+            bar = st.progress(0.0, text="Membaca file…")
+            try:
+                report = bulk.import_file(
+                    table, upload, defaults={"Nama User": active_user} if active_user else None,
+                    progress=lambda fraction, rows: bar.progress(fraction or 0.0, text=f"{rows} baris dibaca…"))
+            except bulk.BulkFileError as e:
+                st.error(str(e))
+            else:
+                st.session_state[f"bulk_report_{table}"] = report
+                st.session_state[gen_key] = gen + 1
+                st.rerun()
+        e1, e2 = st.columns([1, 2])
+        kind = e1.radio("Format export", kinds, horizontal=True, key=f"bulk_kind_{table}")
+        # a callable is only run when the button is clicked
+        e2.download_button("📤 Export", lambda: bulk.export_bytes(table, kind, active_user),
+                           file_name=f"{table}.{kind}", mime=bulk.MIME[kind], key=f"bulk_export_{table}")
+
+
+def freshness(info):
+    """Caption under a section drawn from an out-of-date view (datastore.derived_latest info)."""
+    if info and not info["fresh"]:
+        age = info["age"]
+        ago = f"{age:.0f} dtk" if age < 90 else f"{age / 60:.0f} mnt" if age < 5400 else f"{age / 3600:.0f} jam"
+        st.caption(f"⏳ Hasil dari {ago} lalu; versi terbaru sedang dihitung di latar belakang.")
+
+
+def timing_caption(page, kind, run):
+    # startup.painted() result, shown when TRACKER_TIMING=1
+    if startup.SHOW:
+        st.sidebar.caption(f"⏱️ {page} ({kind}): import {run['imports'] * 1000:.0f} ms · "
+                           f"paint {run['paint'] * 1000:.0f} ms")
+
+
+def _detail(item, skip):
+    return " ".join(f"{k}={v}" for k, v in item.items() if k not in skip)
+
+
+def debug_sidebar(page, t0):
+    """A page's last statement: ends its startup timing and metrics run, and
+    shows them (TRACKER_TIMING / TRACKER_METRICS)."""
+    kind, run = startup.painted(page, t0)
+    timing_caption(page, kind, run)
+    record = metrics.finish(page, kind=kind, **run)
+    if record is None:
+        return
+    with st.sidebar.expander("🔧 Debug · metrics"):
+        st.caption(f"{page} ({kind}) · run {record['seconds'] * 1000:.0f} ms · langkah bertingkat (build termasuk load)")
+        st.dataframe([{"Step": s["step"], "Detail": _detail(s, ("step", "count", "seconds", "max_seconds")),
+                       "n": s["count"], "ms": round(s["seconds"] * 1000, 2)} for s in record["steps"]],
+                     use_container_width=True, hide_index=True)
+        st.dataframe([{"Counter": c["name"], "Detail": _detail(c, ("name", "value")), "Value": c["value"]}
+                      for c in record["counters"]], use_container_width=True, hide_index=True)
+        totals = {}
+        for c in metrics.snapshot()["counters"]:
+            if c["name"] in ("cache_hits", "cache_misses"):
+                totals.setdefault(c["cache"], [0, 0])[c["name"] == "cache_misses"] += c["value"]
+        for cache, (hits, misses) in sorted(totals.items()):
+            st.caption(f"{cache}: {hits / (hits + misses):.0%} hit ({hits}/{hits + misses}) sejak proses dimulai")
+        d1, d2 = st.columns(2)
+        d1.download_button("⬇️ Prometheus", metrics.prometheus(), "tracker_metrics.prom", key=f"metrics_prom_{page}")
+        d2.download_button("⬇️ JSON", json.dumps(metrics.snapshot(), ensure_ascii=False, indent=1),
+                           "tracker_metrics.json", key=f"metrics_json_{page}")